@@ -0,0 +1,143 @@
+import re
+import numpy as np
+from behavior_detector import CHATTY_WORD_LIMIT
+
+# Words and phrases that pad an answer without adding content (matched as whole words)
+FILLER_PHRASES = [
+    'um', 'uh', 'erm', 'hmm', 'like', 'you know', 'basically', 'actually',
+    'literally', 'sort of', 'kind of', 'i mean', 'so yeah', 'stuff like that'
+]
+
+# Cue words for each STAR component
+STAR_CUES = {
+    "situation": ['when i was', 'at my', 'in my previous', 'in my last', 'we had', 'there was', 'the situation', 'back when', 'context'],
+    "task": ['my role', 'my task', 'i was responsible', 'responsible for', 'i needed to', 'i had to', 'the goal', 'our goal', 'assigned'],
+    "action": ['i decided', 'i built', 'i implemented', 'i created', 'i led', 'i designed', 'i worked', 'i started', 'i talked', 'i wrote', 'so i', 'i used'],
+    "result": ['as a result', 'resulted in', 'the result', 'outcome', 'which led to', 'we achieved', 'improved', 'increased', 'reduced', 'saved', 'in the end'],
+}
+STAR_COMPONENTS = list(STAR_CUES)
+
+STOP_WORDS = frozenset("""
+a an the and or but if so of to in on at for with about from by as is are was were be been being
+i me my we our you your he she it its they them their this that these those what which who how why
+do does did have has had can could would should will just very really also then than there here
+tell me about time
+""".split())
+
+SHORT_ANSWER_WORDS = 20  # Below this an answer rarely has room for an example
+
+
+def _phrase_matcher(phrases):
+    alternation = '|'.join(r'\s+'.join(re.escape(word) for word in phrase.split())
+                           for phrase in sorted(phrases, key=len, reverse=True))
+    return re.compile(r'(?<!\w)(?:' + alternation + r')(?!\w)', re.IGNORECASE)
+
+
+_FILLER = _phrase_matcher(FILLER_PHRASES)
+_STAR = {component: _phrase_matcher(cues) for component, cues in STAR_CUES.items()}
+QUANTIFIED_RESULT = re.compile(
+    r'(?<!\w)(?:[$€£]\s?\d[\d,.]*\s?[kmb]?|\d[\d,.]*\s?(?:%|percent|x\b|k\b|ms\b|users|customers|hours|days|weeks|months|people|clients|million|thousand))',
+    re.IGNORECASE
+)
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def _content_words(text):
+    """Content words cut to a 6-letter stem, so "performance" matches "performed" """
+    return {word[:6] for word in _WORD.findall(text.lower()) if word not in STOP_WORDS and len(word) > 2}
+
+
+def question_answer_pairs(messages):
+    """Pair each candidate answer with the interviewer message it responds to"""
+    pairs = []
+    question = ""
+    for message in messages:
+        if message["role"] == "assistant":
+            question = message["content"]
+        elif message["content"].strip():
+            pairs.append((question, message["content"]))
+    return pairs
+
+
+def compute_answer_metrics(messages):
+    """
+    Deterministic per-answer metrics over the whole transcript, aggregated with numpy.
+    Returns a dict of plain Python numbers (safe to serialize and to put in prompts).
+    """
+    pairs = question_answer_pairs(messages)
+    if not pairs:
+        return {"answers": 0}
+
+    texts = [answer.replace("’", "'") for _, answer in pairs]
+    words = np.array([len(text.split()) for text in texts], dtype=float)
+    fillers = np.array([len(_FILLER.findall(text)) for text in texts], dtype=float)
+    quantified = np.array([len(QUANTIFIED_RESULT.findall(text)) for text in texts], dtype=float)
+    star = np.array([[bool(_STAR[component].search(text)) for component in STAR_COMPONENTS] for text in texts], dtype=float)
+
+    overlap = []
+    for question, answer in pairs:
+        question_words, answer_words = _content_words(question), _content_words(answer)
+        overlap.append(len(question_words & answer_words) / len(question_words) if question_words else 0.0)
+    overlap = np.array(overlap)
+
+    safe_words = np.maximum(words, 1)
+    filler_rate = fillers.sum() / safe_words.sum()
+    star_coverage = star.mean(axis=0)
+    star_per_answer = star.sum(axis=1) / len(STAR_COMPONENTS)
+
+    return {
+        "answers": len(pairs),
+        "total_words": int(words.sum()),
+        "words_mean": round(float(words.mean()), 1),
+        "words_median": round(float(np.median(words)), 1),
+        "words_p90": round(float(np.percentile(words, 90)), 1),
+        "words_std": round(float(words.std()), 1),
+        "length_distribution": {
+            "short": int((words < SHORT_ANSWER_WORDS).sum()),
+            "medium": int(((words >= SHORT_ANSWER_WORDS) & (words <= CHATTY_WORD_LIMIT)).sum()),
+            "long": int((words > CHATTY_WORD_LIMIT).sum()),
+        },
+        "filler_count": int(fillers.sum()),
+        "filler_rate": round(float(filler_rate), 3),
+        "star_coverage": {component: round(float(value), 2) for component, value in zip(STAR_COMPONENTS, star_coverage)},
+        "star_complete_answers": int((star_per_answer == 1).sum()),
+        "quantified_mentions": int(quantified.sum()),
+        "quantified_answer_share": round(float((quantified > 0).mean()), 2),
+        "question_overlap_mean": round(float(overlap.mean()), 2),
+        "scores": _scores(words, filler_rate, star_per_answer, quantified, overlap),
+    }
+
+
+def _scores(words, filler_rate, star_per_answer, quantified, overlap):
+    """Map the metrics onto stable 1-5 scores"""
+    # Conciseness peaks for answers between SHORT_ANSWER_WORDS and CHATTY_WORD_LIMIT words
+    in_range = ((words >= SHORT_ANSWER_WORDS) & (words <= CHATTY_WORD_LIMIT)).mean()
+    conciseness = 1 + 4 * in_range - min(filler_rate * 20, 1)
+    structure = 1 + 4 * star_per_answer.mean()
+    specificity = 1 + 4 * min((quantified > 0).mean() * 1.5, 1)
+    # Word overlap misses paraphrases, so even no overlap keeps relevance at 2
+    relevance = 2 + 3 * min(overlap.mean() * 3, 1)
+    return {
+        name: int(np.clip(np.rint(value), 1, 5))
+        for name, value in (("conciseness", conciseness), ("structure", structure),
+                            ("specificity", specificity), ("relevance", relevance))
+    }
+
+
+def format_metrics_for_prompt(metrics):
+    """Compact text block of the metrics for the feedback prompt"""
+    if not metrics or not metrics.get("answers"):
+        return ""
+    lengths = metrics["length_distribution"]
+    star = metrics["star_coverage"]
+    scores = metrics["scores"]
+    return f"""
+MEASURED ANSWER METRICS (computed from the transcript - treat as ground truth):
+- Answers: {metrics['answers']} | words per answer: mean {metrics['words_mean']}, median {metrics['words_median']}, p90 {metrics['words_p90']}
+- Length: {lengths['short']} short (<{SHORT_ANSWER_WORDS} words), {lengths['medium']} medium, {lengths['long']} long (>{CHATTY_WORD_LIMIT} words)
+- Filler words: {metrics['filler_count']} ({metrics['filler_rate']:.1%} of words)
+- STAR coverage (share of answers): situation {star['situation']:.0%}, task {star['task']:.0%}, action {star['action']:.0%}, result {star['result']:.0%}; complete STAR answers: {metrics['star_complete_answers']}
+- Quantified results: {metrics['quantified_mentions']} mentions, in {metrics['quantified_answer_share']:.0%} of answers
+- Relevance to the question asked (word overlap): {metrics['question_overlap_mean']:.0%}
+- Local scores (1-5): conciseness {scores['conciseness']}, structure {scores['structure']}, specificity {scores['specificity']}, relevance {scores['relevance']}
+"""
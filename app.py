@@ -1,15 +1,25 @@
 import streamlit as st
+import streamlit.components.v1 as components
+from streamlit import runtime
 from interview_logic import InterviewAgent
-from feedback_generator import FeedbackGenerator
+from opening_prefetch import OpeningPrefetch
+from feedback_generator import FeedbackGenerator, FEEDBACK_SECTIONS
 from resume_parser import ResumeParser
 from voice_handler import VoiceHandler
+from session_store import get_session_store
+from latency_metrics import get_latency_recorder, timed_stream, STAGES
+from transcript_compactor import format_verbatim
 from config import (INTERVIEW_ROLES, SUPPORTED_RESUME_FORMATS, MAX_RESUME_SIZE_MB, 
-                   INTERVIEW_DURATIONS, ANSWER_TIME_WARNING, ANSWER_TIME_LIMIT)
+                   INTERVIEW_DURATIONS, ANSWER_TIME_WARNING, ANSWER_TIME_LIMIT, LATENCY_METRICS_FILE,
+                   TRANSCRIPT_RECENT_MESSAGES)
 import time
 from datetime import datetime, timedelta
-import base64
+import json
 import os
 
+rerun_started = time.perf_counter()
+reply_playlist = None  # Set when this run starts playing a reply that is still being synthesized
+
 st.set_page_config(
     page_title="Interview Coach - AI Interview Practice",
     layout="wide",
@@ -37,28 +47,262 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Load CSS from external file
-def load_css():
+# Load CSS from external file - read once per process, not on every rerun
+@st.cache_resource
+def get_css():
     with open('styles.css') as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+        return f'<style>{f.read()}</style>'
+
+def load_css():
+    st.markdown(get_css(), unsafe_allow_html=True)
 
 load_css()
 
+@st.cache_resource
+def get_resume_parser():
+    """One resume parser per process, shared by all sessions"""
+    return ResumeParser()
+
+@st.cache_resource
+def get_voice_handler():
+    """One voice handler per process, shared by all sessions"""
+    return VoiceHandler()
+
+latency = get_latency_recorder()
+
+def current_turn():
+    """Turn number for latency spans - the opening question is turn 0"""
+    return st.session_state.get("questions_answered", 0)
+
+def latency_span(stage):
+    """Time a stage of the current turn, tagged with the session and turn number"""
+    return latency.span(stage, st.session_state.get("session_id"), current_turn())
+
+def export_latency_metrics():
+    if LATENCY_METRICS_FILE:
+        try:
+            latency.export(LATENCY_METRICS_FILE)
+        except OSError as e:
+            print(f"Latency metrics export error: {e}")
+
+def record_rerun():
+    """Time this script run - at the end of the script, or just before rerun() cuts it short"""
+    latency.record("rerun", time.perf_counter() - rerun_started, st.session_state.get("session_id"), current_turn())
+    export_latency_metrics()
+
+def rerun():
+    """st.rerun() that still records this run's timing - answer submissions always end this way"""
+    record_rerun()
+    st.rerun()
+
+def render_turn_timings(session_id, turns=5):
+    """Per-turn stage timings for the sidebar, most recent turns last"""
+    breakdown = latency.turn_breakdown(session_id, limit=turns)
+    if not breakdown:
+        st.caption("No turns timed yet")
+        return
+    stages = [stage for stage in STAGES if any(stage in spans for _, spans in breakdown)]
+    rows = ["| Turn | " + " | ".join(STAGES[stage] for stage in stages) + " |", "|---" * (len(stages) + 1) + "|"]
+    for turn, spans in breakdown:
+        cells = [f"{spans[stage]:.2f}s" if stage in spans else "–" for stage in stages]
+        rows.append(f"| {turn} | " + " | ".join(cells) + " |")
+    st.markdown("\n".join(rows))
+
+def audio_source(audio_path):
+    """Same-origin URL for a clip on Streamlit's media endpoint, the route st.audio uses.
+    It stays servable until the session's next run has finished."""
+    url = runtime.get_instance().media_file_mgr.add(audio_path, "audio/mpeg", f"interview_audio.{os.path.basename(audio_path)}")
+    base_path = st.get_option("server.baseUrlPath").strip("/")
+    return f"/{base_path}{url}" if base_path else url
+
 # Helper function to auto-play audio
 def autoplay_audio(audio_path):
-    """Auto-play audio using JavaScript"""
-    if audio_path and os.path.exists(audio_path):
-        with open(audio_path, "rb") as audio_file:
-            audio_bytes = audio_file.read()
-        audio_base64 = base64.b64encode(audio_bytes).decode()
-        audio_html = f"""
-            <audio autoplay>
-                <source src="data:audio/mp3;base64,{audio_base64}" type="audio/mp3">
-            </audio>
-        """
-        st.markdown(audio_html, unsafe_allow_html=True)
+    """Auto-play a single audio file - the browser fetches it by URL, not inline over the websocket"""
+    if not audio_path or not os.path.exists(audio_path):
+        return
+    with latency_span("audio_encode"):
+        st.audio(audio_path, format="audio/mpeg", autoplay=True)
+
+# Plays queued clips back to back; later clips are pushed onto the same queue (on the parent page,
+# shared by the component iframes) while they are still being synthesized. null ends the playlist.
+PLAYLIST_PLAYER_JS = """
+<script>
+const queues = window.parent.interviewAudioQueues = window.parent.interviewAudioQueues || {};
+const queue = queues[PLAYLIST_ID] = queues[PLAYLIST_ID] || [];
+queue.unshift(...SOURCES);
+const audio = new Audio();
+function playNext() {
+    if (!queue.length) { setTimeout(playNext, 200); return; }
+    const src = queue.shift();
+    if (src === null) { delete queues[PLAYLIST_ID]; return; }
+    audio.src = src;
+    audio.play().catch(() => {});
+}
+audio.addEventListener("ended", playNext);
+audio.addEventListener("error", playNext);
+playNext();
+</script>
+"""
+
+PLAYLIST_QUEUE_JS = """
+<script>
+const queues = window.parent.interviewAudioQueues = window.parent.interviewAudioQueues || {};
+(queues[PLAYLIST_ID] = queues[PLAYLIST_ID] || []).push(...SOURCES);
+</script>
+"""
+
+def run_playlist_script(template, playlist_id, sources):
+    """Run a playlist script in a hidden iframe (st.iframe where available, components.html on older Streamlit)"""
+    html = template.replace("PLAYLIST_ID", json.dumps(playlist_id)).replace("SOURCES", json.dumps(sources))
+    if hasattr(st, "iframe"):
+        st.iframe(html, height=1)
+    else:
+        components.html(html, height=0)
+
+def play_reply_audio():
+    """Start the latest reply's audio as soon as its first segment is synthesized.
+    Returns the playlist for finish_reply_audio, which queues the remaining segments once the page is rendered."""
+    speech = st.session_state.reply_speech
+    with latency_span("tts"):
+        first = next(speech.segments(), None)
+    if not first:
+        st.session_state.reply_speech = None
+        return None
+    playlist_id = f"{st.session_state.get('session_id')}-{current_turn()}"
+    with latency_span("audio_encode"):
+        run_playlist_script(PLAYLIST_PLAYER_JS, playlist_id, [audio_source(first)])
+    return playlist_id, [first]
+
+def finish_reply_audio(playlist_id, played):
+    """Queue each remaining segment of the reply as it is synthesized, then keep the joined audio for replays"""
+    speech = st.session_state.reply_speech
+    st.session_state.reply_speech = None
+    segments = list(played)
+    for path in speech.segments():
+        segments.append(path)
+        run_playlist_script(PLAYLIST_QUEUE_JS, playlist_id, [audio_source(path)])
+    run_playlist_script(PLAYLIST_QUEUE_JS, playlist_id, [None])
+    st.session_state.current_audio = voice_handler.join_segments(segments)
+    save_session()
+
+def join_reply_audio():
+    """Wait for the whole reply to be synthesized when it must be played as one file"""
+    speech = st.session_state.reply_speech
+    if speech:
+        st.session_state.reply_speech = None
+        with latency_span("tts"):
+            st.session_state.current_audio = voice_handler.join_segments(list(speech.segments()))
+
+def render_transcript():
+    """Chat bubbles for the latest messages only, so a rerun costs the same however long the interview is.
+    Earlier messages are shown on request as a single block."""
+    messages = st.session_state.messages
+    hidden = max(0, len(messages) - TRANSCRIPT_RECENT_MESSAGES)
+    if hidden and st.toggle(f"Show {hidden} earlier messages", key="show_earlier_messages"):
+        st.markdown(format_verbatim(messages[:hidden]))
+    for msg in messages[hidden:]:
+        with st.chat_message(msg["role"]):
+            st.write(msg["content"])
+
+def respond_to_answer(answer):
+    """Stream the interviewer's reply into the chat and synthesize its audio sentence by sentence.
+    The audio starts playing on the next run, as soon as its first sentence is ready."""
+    st.session_state.messages.append({"role": "user", "content": answer})
+    st.session_state.questions_answered += 1
+    with st.chat_message("user"):
+        st.write(answer)
+    stream = st.session_state.interview_agent.get_next_question_stream(answer)
+    stream = timed_stream(stream, "llm_first_token", "llm_reply", st.session_state.get("session_id"), current_turn(), recorder=latency)
+    speech = voice_handler.start_speech_pipeline() if st.session_state.voice_mode else None
+    
+    def speak_while_streaming(chunks):
+        # Sentences are synthesized in the background while the rest of the reply streams in
+        for chunk in chunks:
+            if speech:
+                speech.feed(chunk)
+            yield chunk
+    
+    with st.chat_message("assistant"):
+        next_q = st.write_stream(speak_while_streaming(stream))
+    st.session_state.messages.append({"role": "assistant", "content": next_q})
+    if speech:
+        speech.close()
+        st.session_state.reply_speech = speech
+        st.session_state.current_audio = None
+    save_session()
+
+def opening_inputs():
+    """Everything the opening question depends on, from the setup page selections"""
+    duration_minutes = INTERVIEW_DURATIONS[st.session_state.selected_duration]
+    return st.session_state.selected_role, duration_minutes, st.session_state.candidate_info, st.session_state.resume_text
+
+def prefetch_opening():
+    """Generate the opening question (and its audio) in the background while the candidate is still on the setup page"""
+    inputs = opening_inputs()
+    prefetch = st.session_state.opening_prefetch
+    if prefetch and prefetch.matches(*inputs, voice_mode=st.session_state.voice_mode):
+        return
+    if prefetch:
+        prefetch.cancel()  # Role, duration, resume or voice mode changed
+    synthesize = voice_handler.text_to_speech_realtime if st.session_state.voice_mode else None
+    st.session_state.opening_prefetch = OpeningPrefetch(*inputs, synthesize=synthesize)
+
+def create_interview_agent():
+    """Take the prefetched agent when it matches the current settings, otherwise build one now"""
+    inputs = opening_inputs()
+    prefetch = st.session_state.opening_prefetch
+    st.session_state.opening_prefetch = None
+    if prefetch and prefetch.matches(*inputs, voice_mode=st.session_state.voice_mode):
+        try:
+            agent, audio_path = prefetch.result()
+            if audio_path:
+                st.session_state.current_audio = audio_path
+            return agent
+        except Exception as e:
+            print(f"Opening prefetch failed, generating now: {e}")
+    role, duration_minutes, candidate_info, resume_text = inputs
+    return InterviewAgent(role, duration_minutes=duration_minutes, candidate_info=candidate_info, resume_text=resume_text)
+
+# Session state saved with the interview so a restarted server can pick it up again
+PERSISTED_STATE_KEYS = ["messages", "feedback_generated", "feedback", "selected_role", "selected_duration",
+                        "candidate_info", "resume_text", "resume_uploaded", "voice_mode", "input_mode",
+                        "current_audio", "interview_started", "closing_message_shown", "transcript_stats"]
+
+def save_session():
+    """Persist the interview after each turn (the session id is kept in the URL)"""
+    agent = st.session_state.get("interview_agent")
+    session_id = st.session_state.get("session_id")
+    if not agent or not session_id:
+        return
+    state = {key: st.session_state[key] for key in PERSISTED_STATE_KEYS if key in st.session_state}
+    state["agent"] = agent.to_dict()
+    try:
+        get_session_store().save(session_id, state)
+    except Exception as e:
+        print(f"Session store error: {e}")
+
+def restore_session():
+    """Rehydrate an interview saved before a restart - the agent's model state is rebuilt on its next call"""
+    session_id = st.query_params.get("session")
+    if not session_id:
+        return
+    try:
+        state = get_session_store().load(session_id)
+    except Exception as e:
+        print(f"Session store error: {e}")
+        return
+    if not state:
+        return
+    st.session_state.session_id = session_id
+    st.session_state.interview_agent = InterviewAgent.from_dict(state.pop("agent"))
+    for key, value in state.items():
+        st.session_state[key] = value
+    st.session_state.last_message_count = len(st.session_state.get("messages", []))
+    st.session_state.questions_answered = len([m for m in st.session_state.get("messages", []) if m['role'] == 'user'])
 
 # Session state initialization
+if 'interview_agent' not in st.session_state:
+    restore_session()
 if 'interview_started' not in st.session_state:
     st.session_state.interview_started = False
 if 'interview_agent' not in st.session_state:
@@ -67,6 +311,8 @@ if 'messages' not in st.session_state:
     st.session_state.messages = []
 if 'feedback_generated' not in st.session_state:
     st.session_state.feedback_generated = False
+if 'transcript_stats' not in st.session_state:
+    st.session_state.transcript_stats = None  # Size of the transcript the feedback was written from
 if 'selected_role' not in st.session_state:
     st.session_state.selected_role = "Software Engineer"
 if 'selected_duration' not in st.session_state:
@@ -85,6 +331,8 @@ if 'resume_uploaded' not in st.session_state:
     st.session_state.resume_uploaded = False
 if 'current_audio' not in st.session_state:
     st.session_state.current_audio = None
+if 'reply_speech' not in st.session_state:
+    st.session_state.reply_speech = None  # Speech pipeline of a reply whose audio hasn't been played yet
 if 'page_title' not in st.session_state:
     st.session_state.page_title = "🎯 AI Interview Coach - Start Your Practice"
 if 'audio_played' not in st.session_state:
@@ -93,9 +341,13 @@ if 'last_message_count' not in st.session_state:
     st.session_state.last_message_count = 0
 if 'closing_message_shown' not in st.session_state:
     st.session_state.closing_message_shown = False
+if 'opening_prefetch' not in st.session_state:
+    st.session_state.opening_prefetch = None
+if 'questions_answered' not in st.session_state:
+    st.session_state.questions_answered = 0
 
-resume_parser = ResumeParser()
-voice_handler = VoiceHandler()
+resume_parser = get_resume_parser()
+voice_handler = get_voice_handler()
 
 # Enhanced Professional Sidebar
 with st.sidebar:
@@ -133,8 +385,11 @@ with st.sidebar:
         st.markdown('<div class="nav-section"><div class="nav-title">Session Statistics</div>', unsafe_allow_html=True)
         st.markdown(f'<div class="stats-card"><div class="stats-label">Role</div><div class="stats-value"><span class="stats-icon">👔</span>{st.session_state.selected_role}</div></div>', unsafe_allow_html=True)
         st.markdown(f'<div class="stats-card"><div class="stats-label">Duration</div><div class="stats-value"><span class="stats-icon">⏱️</span>{st.session_state.selected_duration.split("(")[0].strip()}</div></div>', unsafe_allow_html=True)
-        questions_answered = len([m for m in st.session_state.messages if m['role'] == 'user'])
-        st.markdown(f'<div class="stats-card"><div class="stats-label">Questions Answered</div><div class="stats-value"><span class="stats-icon">✅</span>{questions_answered}</div></div></div>', unsafe_allow_html=True)
+        usage = st.session_state.interview_agent.token_usage.summary()
+        st.markdown(f'<div class="stats-card"><div class="stats-label">Tokens Used</div><div class="stats-value"><span class="stats-icon">🪙</span>{usage["total_tokens"]:,} (${usage["cost_usd"]:.4f})</div></div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="stats-card"><div class="stats-label">Questions Answered</div><div class="stats-value"><span class="stats-icon">✅</span>{st.session_state.questions_answered}</div></div></div>', unsafe_allow_html=True)
+        if st.checkbox("⏱️ Show turn timings", key="show_turn_timings", help="Where the time went in recent turns"):
+            render_turn_timings(st.session_state.get("session_id"))
 
 # Main content
 if not st.session_state.interview_started:
@@ -190,17 +445,22 @@ if not st.session_state.interview_started:
     st.markdown("<br><br>", unsafe_allow_html=True)
     
     if st.session_state.resume_uploaded:
+        prefetch_opening()
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
             if st.button("🚀 Start Interview", type="primary", use_container_width=True):
                 with st.spinner("🎯 Initializing your interview..."):
-                    duration_minutes = INTERVIEW_DURATIONS[st.session_state.selected_duration]
-                    st.session_state.interview_agent = InterviewAgent(st.session_state.selected_role, duration_minutes=duration_minutes, candidate_info=st.session_state.candidate_info, resume_text=st.session_state.resume_text)
+                    st.session_state.interview_agent = create_interview_agent()
+                    if st.session_state.voice_mode:
+                        st.session_state.interview_agent.enable_closing_audio(voice_handler.prewarm_speech)
                     st.session_state.interview_agent.start_interview()
+                    st.session_state.session_id = st.session_state.interview_agent.session_id
+                    st.query_params["session"] = st.session_state.session_id
                     st.session_state.interview_started = True
                     st.session_state.audio_played = False
                     st.session_state.last_message_count = 0
-                st.rerun()
+                    save_session()
+                rerun()
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -213,38 +473,50 @@ elif st.session_state.interview_started:
                 st.markdown(f'<div class="timer-badge timer-warning">⏱️ {mins:02d}:{secs:02d}</div>', unsafe_allow_html=True)
             st.markdown('<div class="interview-page">', unsafe_allow_html=True)
             st.markdown(f'<div class="interview-header"><h2 class="interview-title">{st.session_state.selected_role} Interview</h2><p style="margin: 0.5rem 0 0 0; opacity: 0.95; position: relative; z-index: 1;">Interview Completed</p></div>', unsafe_allow_html=True)
-            for msg in st.session_state.messages:
-                with st.chat_message(msg["role"]):
-                    st.write(msg["content"])
+            render_transcript()
+            join_reply_audio()
             if st.session_state.messages and st.session_state.messages[-1]["role"] == "assistant" and st.session_state.voice_mode and st.session_state.current_audio:
                 autoplay_audio(st.session_state.current_audio)
             st.markdown('</div>', unsafe_allow_html=True)
             st.session_state.closing_message_shown = True
             st.info("⏰ Interview completed. Generating your feedback report...")
             time.sleep(3)
-            st.rerun()
+            rerun()
         
         if not st.session_state.feedback_generated:
             st.markdown('<div class="interview-page">', unsafe_allow_html=True)
             st.title("📊 Analyzing Your Performance...")
-            with st.spinner("Generating comprehensive feedback..."):
-                feedback_gen = FeedbackGenerator(st.session_state.selected_role, st.session_state.interview_agent.get_conversation_history(), candidate_info=st.session_state.candidate_info)
-                feedback = feedback_gen.generate_feedback()
-                st.session_state.feedback = feedback
-                st.session_state.feedback_generated = True
+            feedback_gen = FeedbackGenerator(st.session_state.selected_role, st.session_state.interview_agent.get_conversation_history(), candidate_info=st.session_state.candidate_info, usage=st.session_state.interview_agent.feedback_usage())
+            # One slot per section, filled in report order as each section finishes
+            section_slots = {section: st.empty() for section in FEEDBACK_SECTIONS}
+            for slot in section_slots.values():
+                slot.info("⏳ Generating...")
+            sections = {}
+            for section, markdown in feedback_gen.generate_feedback_sections():
+                sections[section] = markdown
+                section_slots[section].markdown(markdown)
+            st.session_state.feedback = feedback_gen.assemble(sections)
+            st.session_state.transcript_stats = feedback_gen.transcript_stats
+            st.session_state.feedback_generated = True
+            save_session()
             st.markdown('</div>', unsafe_allow_html=True)
-            st.rerun()
+            rerun()
         else:
             st.markdown('<div class="interview-page">', unsafe_allow_html=True)
             st.title("🎯 Interview Feedback Report")
             st.markdown(st.session_state.feedback)
+            stats = st.session_state.transcript_stats
+            if stats and stats["compression_ratio"] < 1:
+                st.caption(f"Feedback was written from a condensed transcript: {stats['compact_tokens']:,} of "
+                           f"{stats['original_tokens']:,} tokens ({stats['compression_ratio']:.0%}).")
             st.markdown("<br>", unsafe_allow_html=True)
             col1, col2 = st.columns(2)
             with col1:
                 if st.button("🔄 Start New Interview", type="primary", use_container_width=True):
                     for key in list(st.session_state.keys()):
                         del st.session_state[key]
-                    st.rerun()
+                    st.query_params.clear()
+                    rerun()
             with col2:
                 st.download_button("📥 Download Feedback", data=st.session_state.feedback, file_name=f"interview_feedback_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md", mime="text/markdown", use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
@@ -262,82 +534,79 @@ elif st.session_state.interview_started:
             q = st.session_state.interview_agent.get_first_question()
             st.session_state.messages.append({"role": "assistant", "content": q})
             if st.session_state.voice_mode:
-                audio_path = voice_handler.text_to_speech_realtime(q)
+                with latency_span("tts"):
+                    audio_path = voice_handler.text_to_speech_realtime(q)
                 if audio_path:
                     st.session_state.current_audio = audio_path
+            save_session()
             time.sleep(0.5)
-            st.rerun()
+            rerun()
         
         current_message_count = len(st.session_state.messages)
         if current_message_count > st.session_state.last_message_count:
             last_msg = st.session_state.messages[-1]
-            if last_msg["role"] == "assistant" and st.session_state.voice_mode and st.session_state.current_audio:
+            if last_msg["role"] == "assistant" and st.session_state.voice_mode and st.session_state.reply_speech:
+                reply_playlist = play_reply_audio()
+                st.session_state.audio_played = True
+            elif last_msg["role"] == "assistant" and st.session_state.voice_mode and st.session_state.current_audio:
                 autoplay_audio(st.session_state.current_audio)
                 st.session_state.audio_played = True
             st.session_state.last_message_count = current_message_count
         
-        for msg in st.session_state.messages:
-            with st.chat_message(msg["role"]):
-                st.write(msg["content"])
+        render_transcript()
         
         st.markdown('<div class="input-section">', unsafe_allow_html=True)
         col1, col2 = st.columns(2)
         with col1:
             if st.button("🎤 Voice Answer", key="voice_tab", use_container_width=True, type="primary" if st.session_state.input_mode == "voice" else "secondary"):
                 st.session_state.input_mode = "voice"
-                st.rerun()
+                rerun()
         with col2:
             if st.button("⌨️ Text Answer", key="text_tab", use_container_width=True, type="primary" if st.session_state.input_mode == "text" else "secondary"):
                 st.session_state.input_mode = "text"
-                st.rerun()
+                rerun()
         st.markdown("<br>", unsafe_allow_html=True)
         
         if st.session_state.input_mode == "voice":
             if not st.session_state.listening:
                 if st.button("🎙️ Click to Speak", type="primary", use_container_width=True):
                     st.session_state.listening = True
-                    st.rerun()
+                    rerun()
             else:
                 st.info("🎤 Listening... Speak your answer now (will stop automatically after you finish)")
-                text, error = voice_handler.listen_continuous(timeout=180)
+                with latency.span("listen", st.session_state.get("session_id"), current_turn() + 1):
+                    text, error = voice_handler.listen_continuous(timeout=180)
                 st.session_state.listening = False
                 if text:
-                    st.session_state.messages.append({"role": "user", "content": text})
-                    with st.spinner("🤔 Processing your response..."):
-                        next_q = st.session_state.interview_agent.get_next_question(text)
-                        st.session_state.messages.append({"role": "assistant", "content": next_q})
-                        if st.session_state.voice_mode:
-                            audio_path = voice_handler.text_to_speech_realtime(next_q)
-                            if audio_path:
-                                st.session_state.current_audio = audio_path
+                    respond_to_answer(text)
                     
                     # CRITICAL: Check if interview ended and immediately transition
                     if st.session_state.interview_agent.is_interview_complete():
                         st.success("✅ Interview ended as requested. Generating feedback...")
                         time.sleep(2)
-                    st.rerun()
+                    rerun()
                 else:
                     st.error(f"❌ {error}")
                     time.sleep(2)
-                    st.rerun()
+                    rerun()
         else:
             user_input = st.text_area("Type your answer here...", height=120, key="text_input", placeholder="Share your experience and thoughts in detail...")
             if st.button("📤 Submit Answer", type="primary", use_container_width=True):
                 if user_input and user_input.strip():
-                    st.session_state.messages.append({"role": "user", "content": user_input})
-                    with st.spinner("🤔 Processing your response..."):
-                        next_q = st.session_state.interview_agent.get_next_question(user_input)
-                        st.session_state.messages.append({"role": "assistant", "content": next_q})
-                        if st.session_state.voice_mode:
-                            audio_path = voice_handler.text_to_speech_realtime(next_q)
-                            if audio_path:
-                                st.session_state.current_audio = audio_path
+                    respond_to_answer(user_input)
                     
                     # CRITICAL: Check if interview ended and immediately transition
                     if st.session_state.interview_agent.is_interview_complete():
                         st.success("✅ Interview ended as requested. Generating feedback...")
                         time.sleep(2)
-                    st.rerun()
+                    rerun()
                 else:
                     st.warning("⚠️ Please enter an answer before submitting")
-        st.markdown('</div></div>', unsafe_allow_html=True)
\ No newline at end of file
+        st.markdown('</div></div>', unsafe_allow_html=True)
+
+# Runs that stop early with rerun() have recorded their timing already
+record_rerun()
+
+# The page is fully rendered - now queue the rest of a reply that started playing this run
+if reply_playlist:
+    finish_reply_audio(*reply_playlist)
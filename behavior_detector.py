@@ -0,0 +1,104 @@
+from collections import namedtuple
+
+# Phrases that signal each behavior (matched as whole words, case-insensitive)
+EXIT_PHRASES = [
+    'end interview', 'stop interview', 'finish interview', 'quit',
+    'want to stop', 'want to end', 'need to leave', 'have to go', 'end this',
+    "that's all", 'no more questions', "i'm done", 'terminate', 'stop this'
+]
+
+OFF_TOPIC_PHRASES = [
+    'by the way', 'speaking of', 'reminds me of', 'fun fact',
+    'also wanted to mention', 'changing the subject', 'random thought',
+    'off topic but', 'not related but'
+]
+
+CONFUSION_PHRASES = [
+    "i don't understand", "i'm confused", "not sure what you mean",
+    "can you clarify", "what do you mean by", "i'm not following",
+    "could you explain", "i don't know", "i'm unsure", "um", "uh",
+    "i guess", "maybe", "i think maybe", "not sure", "confused about"
+]
+
+# Only count as confusion in very short answers
+VAGUE_WORDS = ['maybe', 'guess', 'think', 'not sure']
+
+CHATTY_WORD_LIMIT = 200  # More than this many words counts as off-topic (chatty user)
+VAGUE_ANSWER_WORD_LIMIT = 10
+
+BehaviorSignals = namedtuple("BehaviorSignals", ["wants_exit", "off_topic", "confused", "word_count", "matches"])
+
+
+def _build_token_table():
+    """Byte table that lowercases ASCII letters and blanks every other ASCII character except
+    word characters - splitting the result tokenizes like \\w+. Quotes are blanked too, so
+    'maybe' matches maybe; phrases are tokenized the same way, so i'm matches as i m.
+    Non-ASCII bytes are kept, so accented words stay whole."""
+    table = bytearray(range(256))
+    for byte in range(128):
+        char = chr(byte)
+        if char.isupper():
+            table[byte] = ord(char.lower())
+        elif not (char.isalnum() or char == "_"):
+            table[byte] = ord(" ")
+    return bytes(table)
+
+
+_TOKEN_TABLE = _build_token_table()
+_CURLY_QUOTES = "‘’“”"
+
+
+def _words(encoded):
+    return encoded.translate(_TOKEN_TABLE).split()
+
+
+def _build_phrase_index():
+    """Index phrases by first word - {first word: [(padded words or None, phrase, categories)]}.
+    Multi-word phrases carry their words joined by spaces with a space either side, to be found in the
+    answer's words joined the same way; single-word phrases need nothing beyond the first word."""
+    categories = {}
+    for category, phrases in (("exit", EXIT_PHRASES), ("off_topic", OFF_TOPIC_PHRASES),
+                              ("confusion", CONFUSION_PHRASES), ("vague", VAGUE_WORDS)):
+        for phrase in phrases:
+            categories.setdefault(phrase, []).append(category)
+    index = {}
+    for phrase, phrase_categories in categories.items():
+        words = _words(phrase.encode("utf-8"))
+        padded = b" " + b" ".join(words) + b" " if len(words) > 1 else None
+        index.setdefault(words[0], []).append((padded, phrase, phrase_categories))
+    return index
+
+
+_PHRASE_INDEX = _build_phrase_index()
+_FIRST_WORDS = frozenset(_PHRASE_INDEX)
+
+
+def detect_behavior(user_response):
+    """Classify an answer from a single tokenization of it - returns BehaviorSignals"""
+    text = user_response or ""
+    if not text.isascii():
+        for quote in _CURLY_QUOTES:
+            text = text.replace(quote, " ")
+    matches = {"exit": [], "off_topic": [], "confusion": [], "vague": []}
+    # Only phrases whose first word occurs in the answer are checked. Every category is
+    # checked for each, so overlapping phrases are all reported.
+    words = _words(text.encode("utf-8", "ignore"))
+    joined = None
+    for first_word in _FIRST_WORDS.intersection(words):
+        for padded, phrase, phrase_categories in _PHRASE_INDEX[first_word]:
+            if padded:
+                if joined is None:
+                    joined = b" " + b" ".join(words) + b" "
+                if padded not in joined:
+                    continue
+            for category in phrase_categories:
+                matches[category].append(phrase)
+
+    word_count = len(text.split())  # Whitespace-separated words, as the word limits were set for
+    return BehaviorSignals(
+        wants_exit=bool(matches["exit"]),
+        off_topic=bool(matches["off_topic"]) or word_count > CHATTY_WORD_LIMIT,
+        confused=bool(matches["confusion"]) or (word_count < VAGUE_ANSWER_WORD_LIMIT and bool(matches["vague"])),
+        word_count=word_count,
+        matches=matches
+    )
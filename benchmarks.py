@@ -0,0 +1,290 @@
+"""
+Micro-benchmarks for the local CPU work done on every turn.
+
+Times text cleanup for speech, behavior detection, transcript formatting, prompt
+building, conversation memory and resume text extraction on synthetic fixtures
+(long answers, a 45-minute transcript, realistic and 5 MB resumes). Results are
+written as JSON and compared against a stored baseline on the fastest run of
+each benchmark; one slower than its baseline by more than the threshold plus the
+run-to-run spread of both measurements fails the run.
+
+    python benchmarks.py                        # compare against benchmark_baseline.json
+    python benchmarks.py --save-baseline        # record a new baseline
+    python benchmarks.py -k detect --threshold 0.5
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+from datetime import datetime
+
+os.environ.setdefault("LLM_BACKEND", "fake")  # Nothing here should reach a real model
+
+from behavior_detector import detect_behavior, EXIT_PHRASES, OFF_TOPIC_PHRASES, CONFUSION_PHRASES, VAGUE_WORDS
+from conversation_memory import ConversationMemory
+from answer_metrics import compute_answer_metrics
+from transcript_compactor import compact_transcript
+from interview_logic import AsyncInterviewAgent
+from feedback_generator import FeedbackGenerator
+from resume_parser import ResumeParser, _extract_pdf_pages
+from config import RESUME_TEXT_CHAR_BUDGET
+from voice_handler import VoiceHandler
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+DEFAULT_THRESHOLD = 0.25  # Fail when a benchmark is more than 25% slower than its baseline, beyond measured noise
+DEFAULT_REPEATS = 9
+LARGE_RESUME_BYTES = 5 * 2 ** 20
+
+# ---------------------------------------------------------------- fixtures
+
+LONG_ANSWER = " ".join([
+    "## My Approach\n\n**Situation:** At my last company, our _checkout_ service was timing out during sales 🚀.",
+    "- First, I profiled the hot path with `py-spy` and found N+1 queries.\n- Then I added a [Redis cache](https://redis.io).",
+    "1. We rolled it out behind a flag.\n2. We watched p95 latency drop by 40% for 2 million users ✅.",
+    "```python\ncache.get(key)\n```\nHonestly, um, I think the biggest lesson was, you know, measuring first.",
+    "By the way, that reminds me of another project where I basically rebuilt the reporting pipeline in a weekend.",
+] * 8)
+
+SAMPLE_CANDIDATE = {
+    "name": "Jordan Lee",
+    "skills": ["Python", "SQL", "AWS", "Docker", "React", "Kubernetes", "Terraform", "Go", "Redis", "Kafka", "Airflow"],
+    "years_of_experience": "6 years",
+    "recent_job_title": "Senior Software Engineer",
+    "recent_company": "Example Corp",
+    "education": "BSc Computer Science",
+    "key_projects": ["Checkout latency rewrite", "Realtime analytics pipeline", "Internal developer portal"],
+}
+
+RESUME_LINES = [
+    "Jordan Lee - jordan.lee@example.com - (555) 123-4567",
+    "EXPERIENCE",
+    "Senior Software Engineer, Example Corp, Jan 2020 - Present",
+    "Led a team of five engineers to rebuild the checkout service, cutting p95 latency by 40% for two million users.",
+    "Designed a realtime analytics pipeline on Kafka and Airflow processing 3 billion events per day.",
+    "EDUCATION",
+    "BSc Computer Science, State University, 2014 - 2018",
+    "SKILLS",
+    "Python, SQL, AWS, Docker, Kubernetes, Terraform, Go, Redis, Kafka, Airflow",
+]
+
+
+def transcript_45_minutes():
+    """About 45 exchanges - efficient, chatty and confused answers mixed"""
+    answers = [
+        "I was responsible for the data migration. I planned it in three phases and we finished a week early with zero downtime.",
+        "So this reminds me of a project I did years ago, by the way I also love hiking, " + "and we went through a lot of stages and different ideas along the way " * 20,
+        "Um, I'm not sure what you mean, could you explain that again?",
+    ]
+    messages = [{"role": "assistant", "content": "Hi Jordan, I'm Alex. Tell me about a project you're proud of?"}]
+    for i in range(45):
+        messages.append({"role": "user", "content": answers[i % len(answers)]})
+        messages.append({"role": "assistant", "content": f"That's helpful context. Question {i + 2}: what was the hardest trade-off in that work, and why?"})
+    return messages
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(target_bytes):
+    """Plain-text PDF with enough resume pages to reach roughly target_bytes"""
+    page_stream = "BT /F1 10 Tf 12 TL 50 780 Td " + " ".join(f"({_pdf_escape(line)}) '" for line in RESUME_LINES * 6) + " ET"
+    page_count = max(1, target_bytes // (len(page_stream) + 120))
+
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for _ in range(page_count):
+        content_id = len(objects) + 1
+        objects.append(f"<< /Length {len(page_stream)} >>\nstream\n{page_stream}\nendstream")
+        kids.append(f"{len(objects) + 1} 0 R")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {content_id} 0 R /Resources << /Font << /F1 3 0 R >> >> >>")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {page_count} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1"))
+    return out.getvalue()
+
+
+def make_docx(target_text_bytes):
+    """DOCX with roughly target_text_bytes of resume text"""
+    import docx
+    document = docx.Document()
+    # One paragraph per resume copy - python-docx slows down sharply with many tiny paragraphs
+    block = " ".join(RESUME_LINES)
+    for _ in range(max(1, target_text_bytes // len(block))):
+        document.add_paragraph(block)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+# ---------------------------------------------------------------- benchmarks
+
+def substring_scans(user_response):
+    """The original plain substring checks for exit, off-topic and confusion - a reference
+    point for detect_behavior, which should not be slower"""
+    text = user_response.lower().strip()
+    word_count = len(user_response.split())
+    wants_exit = any(phrase in text for phrase in EXIT_PHRASES)
+    off_topic = any(phrase in text for phrase in OFF_TOPIC_PHRASES) or word_count > 200
+    confused = (any(phrase in text for phrase in CONFUSION_PHRASES)
+                or (word_count < 10 and any(word in text for word in VAGUE_WORDS)))
+    return wants_exit, off_topic, confused
+
+
+def build_benchmarks():
+    """Return {name: zero-argument callable} - fixtures are built once, outside the timed calls"""
+    voice_handler = VoiceHandler()
+    agent = AsyncInterviewAgent("Software Engineer", 45, SAMPLE_CANDIDATE, resume_text="\n".join(RESUME_LINES))
+    transcript = transcript_45_minutes()
+    feedback_gen = FeedbackGenerator("Software Engineer", {"messages": transcript, "behavior_metadata": {}}, candidate_info=SAMPLE_CANDIDATE)
+
+    def fill_memory():
+        memory = ConversationMemory()
+        memory.set_instructions(agent._build_candidate_prompt(), transcript[0]["content"])
+        for i in range(1, len(transcript) - 1, 2):
+            memory.add_turn(transcript[i]["content"], transcript[i + 1]["content"])
+        return memory.build_history()
+
+    resume_parser = ResumeParser()
+    pdf_small, pdf_large = make_pdf(8 * 1024), make_pdf(LARGE_RESUME_BYTES)
+    docx_small, docx_large = make_docx(2 * 1024), make_docx(LARGE_RESUME_BYTES)
+
+    return {
+        "voice.clean_text_for_speech[long_answer]": lambda: voice_handler.clean_text_for_speech(LONG_ANSWER),
+        "behavior._detect_user_exit_request[long_answer]": lambda: agent._detect_user_exit_request(LONG_ANSWER),
+        "behavior._detect_off_topic[long_answer]": lambda: agent._detect_off_topic(LONG_ANSWER),
+        "behavior._detect_confusion[long_answer]": lambda: agent._detect_confusion(LONG_ANSWER),
+        "behavior.detect_behavior[long_answer]": lambda: detect_behavior(LONG_ANSWER),
+        "behavior.substring_scans[long_answer]": lambda: substring_scans(LONG_ANSWER),
+        "feedback._format_transcript[45min]": feedback_gen._format_transcript,
+        "feedback.compact_transcript[45min]": lambda: compact_transcript(transcript),
+        "feedback.compute_answer_metrics[45min]": lambda: compute_answer_metrics(transcript),
+        "memory.build_history[45min]": fill_memory,
+        # The page extraction itself, in process - extract_text adds a round trip to the PDF worker pool
+        "resume.extract_pdf_pages[realistic]": lambda: _extract_pdf_pages(pdf_small, 0, sys.maxsize, RESUME_TEXT_CHAR_BUDGET),
+        "resume.extract_pdf_pages[5mb]": lambda: _extract_pdf_pages(pdf_large, 0, sys.maxsize, RESUME_TEXT_CHAR_BUDGET),
+        "resume.extract_docx[realistic]": lambda: resume_parser.extract_text(docx_small, "docx"),
+        "resume.extract_docx[5mb]": lambda: resume_parser.extract_text(docx_large, "docx"),
+    }
+
+
+def measure(benchmarks, repeats):
+    """Per-call timings over `repeats` timed runs of an auto-sized loop (each run lasts >= 0.2s).
+    Runs are interleaved across benchmarks, so a slow spell on the machine costs each
+    benchmark one run instead of every run of one benchmark."""
+    timers = {}
+    for name, func in benchmarks.items():
+        func()  # Warm up caches and worker pools
+        timer = timeit.Timer(func)
+        timers[name] = (timer, timer.autorange()[0])
+    samples = {name: [] for name in benchmarks}
+    for _ in range(repeats):
+        for name, (timer, loops) in timers.items():
+            samples[name].append(timer.timeit(loops) / loops)
+    return {
+        name: {
+            "median_us": round(statistics.median(samples[name]) * 1e6, 2),
+            "min_us": round(min(samples[name]) * 1e6, 2),
+            "loops": loops,
+            "repeats": repeats,
+        }
+        for name, (timer, loops) in timers.items()
+    }
+
+
+def spread(result):
+    """Relative gap between the median and fastest run - how noisy this measurement was"""
+    return result["median_us"] / result["min_us"] - 1 if result["min_us"] else 0.0
+
+
+def compare(results, baseline, threshold):
+    """Return [(name, current min, baseline min, relative change, allowed change, regressed)]"""
+    rows = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            rows.append((name, result["min_us"], None, None, None, False))
+            continue
+        change = result["min_us"] / base["min_us"] - 1 if base["min_us"] else 0.0
+        allowed = threshold + spread(result) + spread(base)
+        rows.append((name, result["min_us"], base["min_us"], change, allowed, change > allowed))
+    return rows
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark the per-turn CPU hot paths")
+    arg_parser.add_argument("-k", "--filter", help="Only run benchmarks whose name contains this text")
+    arg_parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Timed runs per benchmark")
+    arg_parser.add_argument("-o", "--output", default="benchmark_results.json", help="Where to write results")
+    arg_parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results to compare against")
+    arg_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown (0.25 = 25%%)")
+    arg_parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    args = arg_parser.parse_args()
+
+    benchmarks = build_benchmarks()
+    if args.filter:
+        benchmarks = {name: func for name, func in benchmarks.items() if args.filter in name}
+
+    results = measure(benchmarks, args.repeats)
+    for name, result in results.items():
+        print(f"{name:<50} {result['min_us']:>14,.2f} us")
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeats": args.repeats,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline} - run with --save-baseline to create one")
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    print("=" * 50)
+    print(f"Compared with {args.baseline} (threshold {args.threshold:.0%} plus noise):")
+    print("=" * 50)
+    regressions = []
+    for name, current, base, change, allowed, regressed in compare(results, baseline, args.threshold):
+        if base is None:
+            print(f"{name:<50} {'new':>14}")
+            continue
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<50} {change:>+13.1%}  (allowed {allowed:+.0%}){flag}")
+        if regressed:
+            regressions.append(name)
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
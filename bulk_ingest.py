@@ -0,0 +1,178 @@
+"""
+Bulk resume ingestion.
+
+Parses every PDF/DOCX/TXT resume in a directory and streams one JSON line per
+file to an output file. Re-running with the same output file resumes where the
+previous run stopped.
+
+    python bulk_ingest.py resumes/ -o candidates.jsonl --rpm 60 --concurrency 4
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import SUPPORTED_RESUME_FORMATS, BULK_EXTRACT_WORKERS, BULK_LLM_CONCURRENCY, BULK_REQUESTS_PER_MINUTE
+from resume_parser import ResumeParser, looks_like_resume
+
+
+class RateLimiter:
+    """Spaces out call starts to stay under a requests-per-minute cap"""
+
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def find_resumes(directory, recursive=False):
+    """List supported resume files under directory, sorted for a stable processing order"""
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        for name in files:
+            if os.path.splitext(name)[1].lower() in SUPPORTED_RESUME_FORMATS:
+                paths.append(os.path.join(root, name))
+        if not recursive:
+            break
+    return sorted(paths)
+
+
+def load_checkpoint(output_path):
+    """Return content hashes already written successfully to the output file"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Partial line from an interrupted run
+            if record.get("status") in ("ok", "invalid"):
+                done.add(record["sha256"])
+    return done
+
+
+class BulkIngester:
+    def __init__(self, output_path, workers=BULK_EXTRACT_WORKERS, concurrency=BULK_LLM_CONCURRENCY,
+                 requests_per_minute=BULK_REQUESTS_PER_MINUTE):
+        self.output_path = output_path
+        self.parser = ResumeParser()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract")
+        self.llm_slots = asyncio.Semaphore(concurrency)
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self.counts = {"ok": 0, "invalid": 0, "error": 0, "skipped": 0, "cached": 0, "llm_calls": 0}
+
+    async def run(self, paths):
+        started = time.monotonic()
+        done = load_checkpoint(self.output_path)
+        loop = asyncio.get_running_loop()
+
+        with open(self.output_path, "a", encoding="utf-8") as output:
+            async def process(path):
+                record = await self._process(loop, path, done)
+                if record:
+                    output.write(json.dumps(record) + "\n")
+                    output.flush()  # Every finished line is a checkpoint
+
+            await asyncio.gather(*(process(path) for path in paths))
+
+        self.executor.shutdown()
+        return self._summary(len(paths), time.monotonic() - started)
+
+    async def _process(self, loop, path, done):
+        file_started = time.monotonic()
+        file_type = os.path.splitext(path)[1].lower().lstrip(".")
+        record = {"file": path, "sha256": None}
+        try:
+            file_bytes = await loop.run_in_executor(self.executor, _read_bytes, path)
+            record["sha256"] = hashlib.sha256(file_bytes).hexdigest()
+            if record["sha256"] in done:
+                self.counts["skipped"] += 1
+                return None
+
+            cache_key = self.parser.cache.make_key(file_bytes, file_type)
+            cached = self.parser.cache.get(cache_key)
+            if cached:
+                self.counts["cached"] += 1
+                text, candidate_info = cached
+            else:
+                text = await loop.run_in_executor(self.executor, self.parser.extract_text, file_bytes, file_type)
+                if text.startswith("Error reading"):
+                    raise RuntimeError(text)
+                candidate_info, extracted = await self._analyze(text)
+                self.parser.cache_result(cache_key, text, candidate_info, extracted)
+                if not extracted:
+                    raise RuntimeError("candidate info extraction failed")
+
+            record["status"] = "ok" if candidate_info.get("is_valid_resume") else "invalid"
+            record["chars"] = len(text)
+            record["candidate_info"] = candidate_info
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = str(e)
+
+        record["seconds"] = round(time.monotonic() - file_started, 3)
+        self.counts[record["status"]] += 1
+        return record
+
+    async def _analyze(self, text):
+        """Run candidate-info extraction under the concurrency and rate limits"""
+        if not looks_like_resume(text):
+            # Rejected locally - no model call, so no rate-limit slot needed
+            return await asyncio.to_thread(self.parser._extract_candidate_info, text)
+        async with self.llm_slots:
+            await self.rate_limiter.acquire()
+            self.counts["llm_calls"] += 1
+            return await asyncio.to_thread(self.parser._extract_candidate_info, text)
+
+    def _summary(self, total, elapsed):
+        processed = total - self.counts["skipped"]
+        return {
+            "files": total,
+            **self.counts,
+            "elapsed_seconds": round(elapsed, 2),
+            "files_per_second": round(processed / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Parse a directory of resumes into a JSONL file")
+    arg_parser.add_argument("directory", help="Directory containing PDF, DOCX and TXT resumes")
+    arg_parser.add_argument("-o", "--output", default="candidates.jsonl", help="JSONL output (also the resume checkpoint)")
+    arg_parser.add_argument("-r", "--recursive", action="store_true", help="Include subdirectories")
+    arg_parser.add_argument("--workers", type=int, default=BULK_EXTRACT_WORKERS, help="Parallel text extraction workers")
+    arg_parser.add_argument("--concurrency", type=int, default=BULK_LLM_CONCURRENCY, help="LLM calls in flight at once")
+    arg_parser.add_argument("--rpm", type=float, default=BULK_REQUESTS_PER_MINUTE, help="Max LLM calls per minute (0 = unlimited)")
+    args = arg_parser.parse_args()
+
+    paths = find_resumes(args.directory, recursive=args.recursive)
+    print(f"Found {len(paths)} resumes in {args.directory}")
+
+    ingester = BulkIngester(args.output, workers=args.workers, concurrency=args.concurrency, requests_per_minute=args.rpm)
+    summary = asyncio.run(ingester.run(paths))
+
+    print("=" * 50)
+    print("Bulk ingestion summary:")
+    print("=" * 50)
+    for key, value in summary.items():
+        print(f"{key:>18}: {value}")
+
+
+if __name__ == "__main__":
+    main()
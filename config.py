@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -10,6 +11,11 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 # Gemini Model Configuration
 GEMINI_MODEL = "gemini-2.5-flash"  # Latest fast model
 
+# LLM Backend Settings
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")  # "gemini" or "fake" (offline, deterministic)
+FAKE_LLM_LATENCY = float(os.getenv("FAKE_LLM_LATENCY", "0.0"))  # Seconds per fake model call (time to first token)
+FAKE_LLM_TOKEN_LATENCY = float(os.getenv("FAKE_LLM_TOKEN_LATENCY", "0.0"))  # Seconds per streamed fake word
+
 # Interview Duration Settings (in minutes)
 INTERVIEW_DURATIONS = {
     "Quick Practice (5 min)": 5,
@@ -109,12 +115,65 @@ FEEDBACK_CATEGORIES = [
 
 # Interview Settings
 TEMPERATURE = 0.7  # AI creativity level
+OPENING_PREFETCH_WORKERS = 2  # Opening questions generated in the background while candidates are on the setup page
+CLOSING_PREPARE_WORKERS = 2  # Closings (and their audio) prepared in the background near the end of interviews
+
+# Conversation Memory Settings (keeps per-turn prompt size flat in long interviews)
+MEMORY_RECENT_TURNS = 4  # Exchanges sent verbatim; older ones are folded into a summary
+MEMORY_TOKEN_BUDGET = 3000  # Approximate tokens of history sent per turn
+MEMORY_SUMMARY_TOKEN_BUDGET = 600  # Approximate tokens for the running summary
+
+# Feedback Transcript Settings (compacted transcript sent with the feedback sections that need it)
+FEEDBACK_TRANSCRIPT_TOKEN_BUDGET = 2500  # Approximate tokens of transcript for sections that rate or critique answers
+FEEDBACK_BRIEF_TRANSCRIPT_TOKEN_BUDGET = 800  # Shorter transcript for sections that only cite a few moments
+FEEDBACK_ANSWER_VERBATIM_WORDS = 60  # Answers up to this length are kept word for word
 
 # Voice Settings
 VOICE_ENABLED = True
 TTS_LANGUAGE = "en"
 TTS_SLOW = False  # Speak at normal speed
+TTS_PIPELINE_WORKERS = 4  # Sentences synthesized concurrently in pipelined mode
+TTS_MIN_SEGMENT_CHARS = 40  # Short sentences are merged until a segment reaches this length
+TTS_CACHE_MAX_BYTES = 50 * 1024 * 1024  # On-disk TTS cache cap, least recently used audio is evicted first
+
+# Transcript Display Settings (keeps Streamlit reruns flat in long interviews)
+TRANSCRIPT_RECENT_MESSAGES = 10  # Latest messages rendered as chat bubbles; earlier ones are collapsed
 
 # Resume Parsing Settings
 SUPPORTED_RESUME_FORMATS = [".pdf", ".docx", ".txt"]
-MAX_RESUME_SIZE_MB = 5
\ No newline at end of file
+MAX_RESUME_SIZE_MB = 5
+RESUME_TEXT_CHAR_BUDGET = 8000  # Stop extracting once this much text is collected (prompts use the first 4000)
+PDF_EXTRACTION_WORKERS = 2  # Processes extracting PDF page batches in parallel
+PDF_PAGE_BATCH_SIZE = 4  # Pages per worker task
+PDF_EXTRACTION_TIMEOUT = 15  # Seconds allowed per document before its pool is retired (killed once other uploads are done)
+RESUME_CACHE_DIR = os.getenv("RESUME_CACHE_DIR", os.path.join(tempfile.gettempdir(), "interview_resume_cache"))
+RESUME_CACHE_MEMORY_ENTRIES = 64  # Parsed resumes kept in memory per process
+RESUME_CACHE_TTL_SECONDS = 7 * 86400  # Parsed resumes (personal data) are deleted after this long
+RESUME_CACHE_MAX_FILES = 500  # Parsed resumes kept on disk, oldest deleted first
+
+# Session Store Settings (interviews persisted after every turn so they survive restarts)
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", os.path.join(tempfile.gettempdir(), "interview_sessions", "sessions.db"))  # Directory created owner-only
+SESSION_RETENTION_DAYS = 7  # Sessions untouched for longer are purged at startup
+
+# Turn Service Settings (turn_service.py - headless HTTP API over the session store)
+TURN_SERVICE_HOST = os.getenv("TURN_SERVICE_HOST", "127.0.0.1")
+TURN_SERVICE_PORT = int(os.getenv("TURN_SERVICE_PORT", "8780"))
+TURN_SERVICE_WORKERS = int(os.getenv("TURN_SERVICE_WORKERS", "2"))  # Processes sharing the port
+
+# Latency Metrics Settings (latency_metrics.py - per-stage timing of each turn)
+LATENCY_BUCKETS_SECONDS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 180)  # Histogram bucket upper bounds
+LATENCY_RECENT_TURNS = 500  # Turns (across sessions) kept for the per-turn breakdown
+LATENCY_METRICS_FILE = os.getenv("LATENCY_METRICS_FILE")  # Written after each turn - JSON for *.json, else Prometheus text; unset to disable
+
+# Token Usage Settings (token_usage.py - accounting and per-session budgets)
+GEMINI_INPUT_PRICE_PER_MTOK = float(os.getenv("GEMINI_INPUT_PRICE_PER_MTOK", "0.30"))  # USD per million prompt tokens
+GEMINI_OUTPUT_PRICE_PER_MTOK = float(os.getenv("GEMINI_OUTPUT_PRICE_PER_MTOK", "2.50"))  # USD per million output tokens
+SESSION_TOKEN_BUDGET = int(os.getenv("SESSION_TOKEN_BUDGET", "200000"))  # Prompt + output tokens per interview; 0 = unlimited
+SESSION_BUDGET_TIGHT_FRACTION = 0.8  # Past this share of the budget, prompts are shortened
+BUDGET_TIGHT_MEMORY_TURNS = 2  # Exchanges sent verbatim once the budget is tight
+USAGE_LEDGER_MAX_SESSIONS = 1000  # Sessions whose usage is kept in memory per process
+
+# Bulk Resume Ingestion Settings (bulk_ingest.py)
+BULK_EXTRACT_WORKERS = 4  # Parallel text extraction workers
+BULK_LLM_CONCURRENCY = 4  # Candidate-info extractions in flight at once
+BULK_REQUESTS_PER_MINUTE = 60  # Cap on LLM calls per minute
\ No newline at end of file
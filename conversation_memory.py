@@ -0,0 +1,125 @@
+import re
+from collections import deque
+from config import MEMORY_RECENT_TURNS, MEMORY_TOKEN_BUDGET, MEMORY_SUMMARY_TOKEN_BUDGET
+
+_SENTENCES = re.compile(r'(?<=[.!?])\s+')
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token) - good enough for budgeting"""
+    return len(text) // 4 + 1
+
+
+def _clip_words(text, max_words):
+    words = text.split()
+    if len(words) <= max_words:
+        return " ".join(words)
+    return " ".join(words[:max_words]) + "..."
+
+
+def _main_question(text):
+    """Pick the sentence that actually asks something from an interviewer reply"""
+    sentences = _SENTENCES.split(text.strip())
+    questions = [sentence for sentence in sentences if sentence.endswith("?")]
+    return questions[-1] if questions else sentences[0]
+
+
+class ConversationMemory:
+    """
+    Rolling interview memory sent to the model on every turn:
+    pinned instructions, a running summary of older turns, and the last few turns verbatim.
+    """
+
+    def __init__(self, max_recent_turns=MEMORY_RECENT_TURNS, token_budget=MEMORY_TOKEN_BUDGET,
+                 summary_token_budget=MEMORY_SUMMARY_TOKEN_BUDGET):
+        self.max_recent_turns = max_recent_turns
+        self.token_budget = token_budget
+        self.summary_token_budget = summary_token_budget
+        self.instructions = ""
+        self.opening = ""
+        self.recent_turns = deque()  # (candidate answer, interviewer reply)
+        self.summary_lines = []
+        self.omitted_turns = 0
+
+    def set_instructions(self, instructions, opening):
+        """Pin the system prompt and the interviewer's opening message"""
+        self.instructions = instructions
+        self.opening = opening
+
+    def add_turn(self, answer, reply):
+        """Record a candidate answer and the interviewer's reply, folding old turns as needed"""
+        self.recent_turns.append((answer, reply))
+        self._enforce_budget()
+
+    def set_budget(self, max_recent_turns, token_budget):
+        """Change how much history is sent per turn - older turns are folded into the summary right away"""
+        self.max_recent_turns = max_recent_turns
+        self.token_budget = token_budget
+        self._enforce_budget()
+
+    def _enforce_budget(self):
+        while self.recent_turns and (
+            len(self.recent_turns) > self.max_recent_turns
+            or (self.prompt_tokens() > self.token_budget and len(self.recent_turns) > 1)
+        ):
+            answer, reply = self.recent_turns.popleft()
+            self.summary_lines.append(
+                f"- Candidate said: {_clip_words(answer, 40)} | You then asked: {_clip_words(_main_question(reply), 25)}"
+            )
+
+        # Oldest summary lines go first when the summary itself grows too large
+        while len(self.summary_lines) > 1 and estimate_tokens("\n".join(self.summary_lines)) > self.summary_token_budget:
+            self.summary_lines.pop(0)
+            self.omitted_turns += 1
+
+    def _summary_text(self):
+        if not self.summary_lines:
+            return ""
+        omitted = f"\n- ({self.omitted_turns} earlier exchanges omitted)" if self.omitted_turns else ""
+        return "\n\nINTERVIEW SO FAR (summary of earlier exchanges):" + omitted + "\n" + "\n".join(self.summary_lines)
+
+    def build_history(self):
+        """Return chat history (repo message format) for the next model call"""
+        history = [
+            {"role": "user", "content": self.instructions + self._summary_text()},
+            {"role": "assistant", "content": self.opening},
+        ]
+        for answer, reply in self.recent_turns:
+            history.append({"role": "user", "content": f'Candidate\'s response: "{answer}"'})
+            history.append({"role": "assistant", "content": reply})
+        return history
+
+    def prompt_tokens(self):
+        """Estimated tokens of the history that would be sent right now"""
+        return sum(estimate_tokens(message["content"]) for message in self.build_history())
+
+    def to_dict(self):
+        """JSON-serializable snapshot - see from_dict"""
+        return {
+            "max_recent_turns": self.max_recent_turns,
+            "token_budget": self.token_budget,
+            "summary_token_budget": self.summary_token_budget,
+            "instructions": self.instructions,
+            "opening": self.opening,
+            "recent_turns": [list(turn) for turn in self.recent_turns],
+            "summary_lines": list(self.summary_lines),
+            "omitted_turns": self.omitted_turns,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        memory = cls(data["max_recent_turns"], data["token_budget"], data["summary_token_budget"])
+        memory.instructions = data["instructions"]
+        memory.opening = data["opening"]
+        memory.recent_turns = deque(tuple(turn) for turn in data["recent_turns"])
+        memory.summary_lines = list(data["summary_lines"])
+        memory.omitted_turns = data["omitted_turns"]
+        return memory
+
+    def stats(self):
+        return {
+            "recent_turns": len(self.recent_turns),
+            "summarized_turns": len(self.summary_lines),
+            "omitted_turns": self.omitted_turns,
+            "prompt_tokens": self.prompt_tokens(),
+        }
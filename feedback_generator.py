@@ -1,11 +1,183 @@
-import google.generativeai as genai
-from config import GEMINI_API_KEY, GEMINI_MODEL, FEEDBACK_CATEGORIES
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config import FEEDBACK_CATEGORIES, FEEDBACK_TRANSCRIPT_TOKEN_BUDGET, FEEDBACK_BRIEF_TRANSCRIPT_TOKEN_BUDGET
+from llm_gateway import get_gateway
+from answer_metrics import compute_answer_metrics, format_metrics_for_prompt
+from transcript_compactor import compact_transcript
+from token_usage import UsageTag, BUDGET_OK, BUDGET_TIGHT, BUDGET_EXHAUSTED
+
+# Report sections, in the order they appear in the final document
+FEEDBACK_SECTIONS = ["persona", "ratings", "strengths", "improvements", "action_plan"]
+
+# Context blocks each section is written from. Sections are generated in parallel, so every block
+# is paid for once per section that includes it - each gets only what its format asks for.
+SECTION_CONTEXT = {
+    "persona": ["behavior_insights", "brief_transcript"],
+    "ratings": ["resume_context", "persona_summary", "metrics_text", "transcript"],
+    "strengths": ["resume_context", "brief_transcript"],
+    "improvements": ["behavior_insights", "metrics_text", "transcript"],
+    "action_plan": ["resume_context", "persona_summary", "metrics_text"],
+}
+
+SECTION_FORMATS = {
+    "persona": """## 🎭 User Persona Identified: {user_persona}
 
-# Configure Gemini
-genai.configure(api_key=GEMINI_API_KEY)
+**What This Means:** [2-3 sentences explaining what this persona type is and specific behaviors you observed in THIS interview]
+
+**Key Observations:**
+{key_observations_text}""",
+
+    "ratings": """## 🎯 Interview Performance Summary
+
+**Overall Rating:** ⭐⭐⭐⭐☆ (X/5)
+
+**Quick Summary:** [1-2 sentences about overall performance]
+
+---
+
+## 📊 Performance Ratings
+
+### Communication Clarity
+**Rating:** ⭐⭐⭐⭐☆ (X/5)
+**Strength:** [1 specific strength in 1 line]
+**Improve:** [1 actionable tip in 1 line]
+
+### Technical/Domain Knowledge
+**Rating:** ⭐⭐⭐⭐☆ (X/5)
+**Strength:** [1 specific strength in 1 line]
+**Improve:** [1 actionable tip in 1 line]
+
+### Answer Structure (STAR Method)
+**Rating:** ⭐⭐⭐⭐☆ (X/5)
+**Strength:** [1 specific strength in 1 line]
+**Improve:** [1 actionable tip in 1 line]
+
+### Confidence & Professionalism
+**Rating:** ⭐⭐⭐⭐☆ (X/5)
+**Strength:** [1 specific strength in 1 line]
+**Improve:** [1 actionable tip in 1 line]
+
+### Use of Examples
+**Rating:** ⭐⭐⭐⭐☆ (X/5)
+**Strength:** [1 specific strength in 1 line]
+**Improve:** [1 actionable tip in 1 line]""",
+
+    "strengths": """## 💪 Top 3 Strengths
+
+1. **[Strength Name]** - [Brief 1-line explanation with example]
+2. **[Strength Name]** - [Brief 1-line explanation with example]
+3. **[Strength Name]** - [Brief 1-line explanation with example]""",
+
+    "improvements": """## 🎯 Top 3 Areas to Improve
+
+1. **[Improvement Area]** - [1 specific actionable tip]
+2. **[Improvement Area]** - [1 specific actionable tip]
+3. **[Improvement Area]** - [1 specific actionable tip]
+
+---
+
+## 💬 Persona-Specific Advice
+
+**Based on your {user_persona} behavior pattern, here's targeted advice:**
+
+[Provide 3-4 bullet points of SPECIFIC advice for this persona type, referencing actual moments from the interview]
+
+Example for Chatty User:
+- Your answer about [specific project] went off-topic when you mentioned [unrelated detail] - focus on the core question
+- Practice the 90-second rule: Situation (15s), Task (15s), Action (45s), Result (15s)
+- Before answering, mentally ask: "Does this directly answer the question?"
+
+Example for Confused User (IMPORTANT - This user struggled with comprehension):
+- You said "I'm confused" or "I don't understand" {confusion} times - this shows you need more preparation on {role} concepts
+- When I asked about [specific topic], you expressed uncertainty - here's what it means: [brief explanation]
+- In real interviews, it's GOOD to ask: "Could you clarify what you mean by [technical term]?" or "Can you give me an example?"
+- Action: Research and study these concepts you were confused about: [list specific topics]
+- Practice explaining technical terms in simple language to build confidence
+- Your comprehension challenges suggest starting with entry-level interview prep materials
+
+Example for Early Exit User:
+- You completed {duration_used:.1f} minutes before requesting to end - build stamina with 5-minute practice sessions, then 10, then 15
+- Practice interviews with friends to build confidence
+- Remember: it's okay to take a breath between questions
+
+Example for Efficient User:
+- Your structured approach was excellent - consider adding more quantifiable metrics to strengthen impact
+- You stayed focused throughout - in longer interviews, this consistency will set you apart""",
+
+    "action_plan": """## 🚀 Action Plan
+
+**Before Your Next Interview:**
+1. [Specific action item]
+2. [Specific action item]
+3. [Specific action item]
+
+**Practice Questions:**
+1. [1 challenging question for their role]
+2. [1 scenario-based question]
+
+---
+
+## ✨ Final Verdict
+
+**Interview Readiness:** [Beginner/Intermediate/Advanced/Interview-Ready]
+
+**One Key Takeaway:** [Most important thing to remember - 1 sentence]
+
+**Encouragement:** [Brief encouraging message - 1-2 sentences]""",
+}
+
+RATING_GUIDANCE = """- Use ⭐ emojis for all ratings (1-5 stars)
+- Each "Strength" and "Improve" should be ONE line only
+
+RATING GUIDANCE BY PERSONA:
+- CONFUSED USER: Communication Clarity should be ⭐⭐☆☆☆ (2/5) or ⭐⭐⭐☆☆ (3/5) maximum due to comprehension issues
+- CONFUSED USER: Technical Knowledge should be ⭐⭐☆☆☆ (2/5) since they didn't understand basic concepts
+- CONFUSED USER: Overall Rating should be ⭐⭐☆☆☆ (2/5) or ⭐⭐⭐☆☆ (3/5) maximum
+- CHATTY USER: Communication Clarity reduced by 1 star for being unfocused
+- EFFICIENT USER: Communication Clarity should be ⭐⭐⭐⭐⭐ (5/5) or ⭐⭐⭐⭐☆ (4/5)
+- EARLY EXIT: Rate based on completed portion, mention interview was incomplete
+- When MEASURED ANSWER METRICS are given, keep each rating within 1 star of its local score: Communication Clarity - conciseness, Technical/Domain Knowledge - relevance, Answer Structure - structure, Use of Examples - specificity"""
+
+# Report categories rated from the local answer scores when the token budget is spent
+LOCAL_RATINGS = [
+    ("Communication Clarity", "conciseness"),
+    ("Technical/Domain Knowledge", "relevance"),
+    ("Answer Structure (STAR Method)", "structure"),
+    ("Use of Examples", "specificity"),
+]
+
+# Used per section when its generation fails
+FALLBACK_SECTIONS = {
+    "persona": """## 🎭 User Persona Identified: {user_persona}
+
+**Key Observations:**
+{key_observations_text}""",
+
+    "ratings": """## Basic Feedback
+
+**Overall Rating:** ⭐⭐⭐⭐☆ (4/5)
+
+Thank you for completing the interview!""",
+
+    "strengths": """**Top Strengths:**
+1. Good communication throughout
+2. Relevant examples provided
+3. Professional demeanor""",
+
+    "improvements": """**Areas to Improve:**
+1. Use STAR method more consistently
+2. Provide more specific metrics in examples
+3. Practice technical/domain questions more""",
+
+    "action_plan": """**Next Steps:**
+1. Review STAR method (Situation, Task, Action, Result)
+2. Prepare 3-5 strong stories with metrics
+3. Research the company before interviews
+
+Keep practicing - you're making progress! 💪""",
+}
 
 class FeedbackGenerator:
-    def __init__(self, role, conversation_history, candidate_info=None):
+    def __init__(self, role, conversation_history, candidate_info=None, usage=None):
         self.role = role
         
         # Handle both old format (list) and new format (dict with metadata)
@@ -16,14 +188,23 @@ class FeedbackGenerator:
             self.conversation_history = conversation_history
             self.behavior_metadata = {}
         
+        # Measured locally - older callers may not have attached them
+        self.answer_metrics = self.behavior_metadata.get("answer_metrics") or compute_answer_metrics(self.conversation_history)
+        
         self.candidate_info = candidate_info
-        self.model = genai.GenerativeModel(GEMINI_MODEL)
+        self.llm = get_gateway()
+        self.transcript_stats = None  # Token counts and compression ratio of the transcript the report is rated from
+        
+        # Feedback calls are billed to usage (a UsageTag, e.g. agent.feedback_usage()) and its totals' budget
+        self.usage = usage or UsageTag(None, "feedback", "feedback")
+        self.budget_state = self.usage.totals.budget_state() if self.usage.totals is not None else BUDGET_OK
     
-    def generate_feedback(self):
-        """Generate concise interview feedback with ratings and brief tips"""
+    def _build_context(self):
+        """Prompt context for the feedback sections - built once, locally"""
         
-        # Create conversation transcript
-        transcript = self._format_transcript()
+        # Full transcript for rating and critique, a shorter one for sections that cite a few moments
+        transcript = self._format_transcript(record_stats=True)
+        brief_transcript = self._format_transcript(FEEDBACK_BRIEF_TRANSCRIPT_TOKEN_BUDGET)
         
         # Build resume context if available
         resume_context = ""
@@ -39,8 +220,11 @@ CANDIDATE BACKGROUND:
 
         # Build behavior insights
         behavior_insights = ""
+        persona_summary = ""
         user_persona = "Standard User"
         persona_notes = []
+        confusion = 0
+        duration_used = 0
         
         if self.behavior_metadata:
             off_topic = self.behavior_metadata.get('off_topic_count', 0)
@@ -88,6 +272,10 @@ CANDIDATE BACKGROUND:
                 user_persona = "Standard User"
                 persona_notes.append("You showed typical interview behavior with room for improvement")
             
+            persona_summary = f"""
+USER PERSONA: {user_persona} (off-topic {off_topic} times, confusion {confusion} times, {'early exit requested' if early_exit else 'completed normally'}, {duration_used:.1f} minutes used)
+"""
+            
             # Build persona notes list
             persona_notes_text = '\n'.join([f'• {note}' for note in persona_notes])
             if not persona_notes_text:
@@ -149,184 +337,101 @@ FOR EFFICIENT USER:
         # Build key observations for prompt
         key_observations_text = '\n'.join([f'- {note}' for note in persona_notes]) if persona_notes else '- Standard interview behavior observed'
 
-        feedback_prompt = f"""You are an expert interview coach analyzing a {self.role} interview.
-
-{resume_context}
-{behavior_insights}
-
-INTERVIEW TRANSCRIPT:
-{transcript}
-
-MANDATORY: Your feedback MUST start with this exact structure:
-
-## 🎭 User Persona Identified: {user_persona}
-
-**What This Means:** [2-3 sentences explaining what this persona type is and specific behaviors you observed in THIS interview]
-
-**Key Observations:**
-{key_observations_text}
-
----
-
-Then provide CONCISE, focused feedback in the following format:
-
-## 🎯 Interview Performance Summary
-
-**Overall Rating:** ⭐⭐⭐⭐☆ (X/5)
-
-**Quick Summary:** [1-2 sentences about overall performance]
-
----
-
-## 📊 Performance Ratings
-
-### Communication Clarity
-**Rating:** ⭐⭐⭐⭐☆ (X/5)
-**Strength:** [1 specific strength in 1 line]
-**Improve:** [1 actionable tip in 1 line]
-
-### Technical/Domain Knowledge
-**Rating:** ⭐⭐⭐⭐☆ (X/5)
-**Strength:** [1 specific strength in 1 line]
-**Improve:** [1 actionable tip in 1 line]
-
-### Answer Structure (STAR Method)
-**Rating:** ⭐⭐⭐⭐☆ (X/5)
-**Strength:** [1 specific strength in 1 line]
-**Improve:** [1 actionable tip in 1 line]
-
-### Confidence & Professionalism
-**Rating:** ⭐⭐⭐⭐☆ (X/5)
-**Strength:** [1 specific strength in 1 line]
-**Improve:** [1 actionable tip in 1 line]
-
-### Use of Examples
-**Rating:** ⭐⭐⭐⭐☆ (X/5)
-**Strength:** [1 specific strength in 1 line]
-**Improve:** [1 actionable tip in 1 line]
-
----
-
-## 💪 Top 3 Strengths
-
-1. **[Strength Name]** - [Brief 1-line explanation with example]
-2. **[Strength Name]** - [Brief 1-line explanation with example]
-3. **[Strength Name]** - [Brief 1-line explanation with example]
-
----
-
-## 🎯 Top 3 Areas to Improve
-
-1. **[Improvement Area]** - [1 specific actionable tip]
-2. **[Improvement Area]** - [1 specific actionable tip]
-3. **[Improvement Area]** - [1 specific actionable tip]
-
----
-
-## 💬 Persona-Specific Advice
-
-**Based on your {user_persona} behavior pattern, here's targeted advice:**
-
-[Provide 3-4 bullet points of SPECIFIC advice for this persona type, referencing actual moments from the interview]
-
-Example for Chatty User:
-- Your answer about [specific project] went off-topic when you mentioned [unrelated detail] - focus on the core question
-- Practice the 90-second rule: Situation (15s), Task (15s), Action (45s), Result (15s)
-- Before answering, mentally ask: "Does this directly answer the question?"
-
-Example for Confused User (IMPORTANT - This user struggled with comprehension):
-- You said "I'm confused" or "I don't understand" {confusion} times - this shows you need more preparation on {self.role} concepts
-- When I asked about [specific topic], you expressed uncertainty - here's what it means: [brief explanation]
-- In real interviews, it's GOOD to ask: "Could you clarify what you mean by [technical term]?" or "Can you give me an example?"
-- Action: Research and study these concepts you were confused about: [list specific topics]
-- Practice explaining technical terms in simple language to build confidence
-- Your comprehension challenges suggest starting with entry-level interview prep materials
-
-Example for Early Exit User:
-- You completed {duration_used:.1f} minutes before requesting to end - build stamina with 5-minute practice sessions, then 10, then 15
-- Practice interviews with friends to build confidence
-- Remember: it's okay to take a breath between questions
-
-Example for Efficient User:
-- Your structured approach was excellent - consider adding more quantifiable metrics to strengthen impact
-- You stayed focused throughout - in longer interviews, this consistency will set you apart
-
----
-
-## 🚀 Action Plan
-
-**Before Your Next Interview:**
-1. [Specific action item]
-2. [Specific action item]
-3. [Specific action item]
-
-**Practice Questions:**
-1. [1 challenging question for their role]
-2. [1 scenario-based question]
-
----
-
-## ✨ Final Verdict
-
-**Interview Readiness:** [Beginner/Intermediate/Advanced/Interview-Ready]
-
-**One Key Takeaway:** [Most important thing to remember - 1 sentence]
+        return {
+            "resume_context": resume_context,
+            "behavior_insights": behavior_insights,
+            "persona_summary": persona_summary,
+            "metrics_text": format_metrics_for_prompt(self.answer_metrics),
+            "transcript": f"INTERVIEW TRANSCRIPT:\n{transcript}\n",
+            "brief_transcript": f"INTERVIEW TRANSCRIPT (condensed):\n{brief_transcript}\n",
+            "user_persona": user_persona,
+            "key_observations_text": key_observations_text,
+            "confusion": confusion,
+            "duration_used": duration_used,
+        }
+    
+    def generate_feedback(self):
+        """Generate concise interview feedback with ratings and brief tips"""
+        return self.assemble(dict(self.generate_feedback_sections()))
+    
+    def generate_feedback_sections(self):
+        """Generate every section concurrently - yields (section, markdown) as each one finishes"""
+        context = self._build_context()
+        if self.budget_state == BUDGET_EXHAUSTED:
+            # Token budget spent - the report is built from the local analysis instead
+            for section in FEEDBACK_SECTIONS:
+                yield section, self._local_section(section, context)
+            return
+        
+        with ThreadPoolExecutor(max_workers=len(FEEDBACK_SECTIONS), thread_name_prefix="feedback") as executor:
+            futures = {
+                executor.submit(self.llm.generate, self._section_prompt(section, context),
+                                usage=self.usage._replace(call_site=f"feedback.{section}")): section
+                for section in FEEDBACK_SECTIONS
+            }
+            for future in as_completed(futures):
+                section = futures[future]
+                try:
+                    yield section, future.result().strip()
+                except Exception as e:
+                    yield section, self._fallback_section(section, context, e)
+    
+    @staticmethod
+    def assemble(sections):
+        """Join finished sections into the report, always in FEEDBACK_SECTIONS order"""
+        return "\n\n---\n\n".join(sections[section] for section in FEEDBACK_SECTIONS if sections.get(section))
+    
+    def _section_prompt(self, section, context):
+        """The interview context this section needs plus the format of the section"""
+        section_format = SECTION_FORMATS[section].format(role=self.role, **context)
+        rating_guidance = RATING_GUIDANCE if section == "ratings" else ""
+        section_context = "\n".join(context[name] for name in SECTION_CONTEXT[section])
+        
+        return f"""You are an expert interview coach analyzing a {self.role} interview.
+{section_context}
 
-**Encouragement:** [Brief encouraging message - 1-2 sentences]
+You are writing ONE section of a longer feedback report - other sections are written separately.
+Write ONLY this section, in exactly this format, with nothing before or after it:
 
----
+{section_format}
 
 CRITICAL INSTRUCTIONS:
 - Keep it CONCISE - no long explanations
 - Be SPECIFIC - reference actual interview moments briefly
-- Use ⭐ emojis for all ratings (1-5 stars)
-- Each "Strength" and "Improve" should be ONE line only
 - Focus on actionable advice
 - Make it encouraging but honest
-- Total length should be much shorter than typical feedback
-
-RATING GUIDANCE BY PERSONA:
-- CONFUSED USER: Communication Clarity should be ⭐⭐☆☆☆ (2/5) or ⭐⭐⭐☆☆ (3/5) maximum due to comprehension issues
-- CONFUSED USER: Technical Knowledge should be ⭐⭐☆☆☆ (2/5) since they didn't understand basic concepts
-- CONFUSED USER: Overall Rating should be ⭐⭐☆☆☆ (2/5) or ⭐⭐⭐☆☆ (3/5) maximum
-- CHATTY USER: Communication Clarity reduced by 1 star for being unfocused
-- EFFICIENT USER: Communication Clarity should be ⭐⭐⭐⭐⭐ (5/5) or ⭐⭐⭐⭐☆ (4/5)
-- EARLY EXIT: Rate based on completed portion, mention interview was incomplete"""
-
-        try:
-            # Generate feedback
-            response = self.model.generate_content(feedback_prompt)
-            return response.text
-        except Exception as e:
-            return f"""⚠️ Error generating feedback: {str(e)}
-
-## Basic Feedback
-
-**Overall Rating:** ⭐⭐⭐⭐☆ (4/5)
-
-Thank you for completing the interview!
-
-**Top Strengths:**
-1. Good communication throughout
-2. Relevant examples provided
-3. Professional demeanor
-
-**Areas to Improve:**
-1. Use STAR method more consistently
-2. Provide more specific metrics in examples
-3. Practice technical/domain questions more
-
-**Next Steps:**
-1. Review STAR method (Situation, Task, Action, Result)
-2. Prepare 3-5 strong stories with metrics
-3. Research the company before interviews
-
-Keep practicing - you're making progress! 💪"""
+{rating_guidance}"""
+    
+    def _fallback_section(self, section, context, error):
+        """Static section used when its generation fails, so the rest of the report still ships"""
+        return f"⚠️ Error generating this section: {str(error)}\n\n" + FALLBACK_SECTIONS[section].format(**context)
+    
+    def _local_section(self, section, context):
+        """Section written without the model - ratings come from the local answer scores"""
+        scores = self.answer_metrics.get("scores")
+        if section == "ratings" and scores:
+            lines = ["## 📊 Performance Ratings (from answer analysis)", ""]
+            for category, score_name in LOCAL_RATINGS:
+                score = scores[score_name]
+                lines.append(f"**{category}:** {'⭐' * score}{'☆' * (5 - score)} ({score}/5)")
+            return "\n".join(lines)
+        markdown = FALLBACK_SECTIONS[section].format(**context)
+        if section == "persona":
+            markdown = "ℹ️ This report was built from a local analysis of your answers.\n\n" + markdown
+        return markdown
     
-    def _format_transcript(self):
-        """Format conversation history as readable transcript"""
-        transcript = []
-        for i, msg in enumerate(self.conversation_history):
-            role = "🎤 Interviewer" if msg["role"] == "assistant" else "👤 Candidate"
-            transcript.append(f"{role}: {msg['content']}")
-        return "\n\n".join(transcript)
\ No newline at end of file
+    def _format_transcript(self, token_budget=FEEDBACK_TRANSCRIPT_TOKEN_BUDGET, record_stats=False):
+        """Format conversation history as a transcript compacted to token_budget.
+        With record_stats, its size against the full transcript is kept in transcript_stats."""
+        # Shorter prompts once the interview's token budget is tight
+        if self.budget_state == BUDGET_TIGHT:
+            token_budget //= 2
+        compact = compact_transcript(self.conversation_history, token_budget=token_budget)
+        if not record_stats:
+            return compact.text
+        self.transcript_stats = {
+            "original_tokens": compact.original_tokens,
+            "compact_tokens": compact.compact_tokens,
+            "compression_ratio": compact.compression_ratio,
+        }
+        return compact.text
\ No newline at end of file
@@ -1,68 +1,48 @@
-import google.generativeai as genai
-from config import GEMINI_API_KEY, GEMINI_MODEL, INTERVIEW_ROLES
+import asyncio
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from config import INTERVIEW_ROLES, CLOSING_PREPARE_WORKERS, BUDGET_TIGHT_MEMORY_TURNS, MEMORY_TOKEN_BUDGET
+from functools import lru_cache
 from datetime import datetime, timedelta
+from llm_gateway import get_gateway
+from behavior_detector import detect_behavior
+from conversation_memory import ConversationMemory
+from answer_metrics import compute_answer_metrics
+from token_usage import UsageTag, UsageTotals, BUDGET_OK, BUDGET_TIGHT, BUDGET_EXHAUSTED
+
+# Personalized closings - used as-is, or until a background-generated closing is ready
+CLOSING_TEMPLATES = {
+    "early_exit": "I completely understand, {name}. Thank you for your time today - I appreciate the insights you've shared. You'll receive feedback on the portion we completed shortly. Best of luck with your job search!",
+    "time_up": "I'm sorry to interrupt you, but our time has concluded. Thank you so much for your time today, {name}. You'll receive detailed feedback shortly. It was a pleasure speaking with you!",
+    "completed": "Thank you so much for your time today, {name} - I really enjoyed hearing about your experience. You'll receive detailed feedback on your {role} interview shortly. Best of luck!",
+}
+
+_closing_executor = None
+_closing_executor_lock = threading.Lock()
+
+
+def _get_closing_executor():
+    """Return the process-wide pool that prepares closings in the background"""
+    global _closing_executor
+    if _closing_executor is None:
+        with _closing_executor_lock:
+            if _closing_executor is None:
+                _closing_executor = ThreadPoolExecutor(max_workers=CLOSING_PREPARE_WORKERS, thread_name_prefix="closing")
+    return _closing_executor
+
+
+@lru_cache(maxsize=None)
+def build_interview_instructions(role, duration_minutes):
+    """Interviewer instructions that depend only on role and duration (the shared prompt prefix)"""
+    role_info = INTERVIEW_ROLES.get(role, {})
+    focus_areas = ", ".join(role_info.get("focus_areas", []))
+    
+    return f"""You are Alex, a professional interviewer conducting a {role} interview.
 
-# Configure Gemini
-genai.configure(api_key=GEMINI_API_KEY)
-
-class InterviewAgent:
-    def __init__(self, role, duration_minutes, candidate_info=None, resume_text=None):
-        self.role = role
-        self.model = genai.GenerativeModel(GEMINI_MODEL)
-        self.chat = None
-        self.conversation_history = []
-        self.candidate_info = candidate_info or {}
-        self.resume_text = resume_text
-        self.candidate_name = candidate_info.get('name', 'Candidate') if candidate_info else 'Candidate'
-        
-        # Time management
-        self.duration_minutes = duration_minutes
-        self.start_time = None
-        self.end_time = None
-        self.is_final_question = False
-        self.interview_ended = False
-        
-        # User behavior tracking
-        self.off_topic_count = 0
-        self.confusion_indicators = 0
-        self.silence_count = 0
-        self.user_requested_exit = False
-        
-        # Initialize chat session
-        self._initialize_chat()
-        
-    def _initialize_chat(self):
-        """Initialize Gemini chat session with time-aware system prompt"""
-        role_info = INTERVIEW_ROLES.get(self.role, {})
-        focus_areas = ", ".join(role_info.get("focus_areas", []))
-        
-        # Build resume context if available
-        resume_context = ""
-        if self.candidate_info:
-            resume_context = f"""
-
-CANDIDATE BACKGROUND:
-- Name: {self.candidate_info.get('name', 'Not provided')}
-- Skills: {', '.join(self.candidate_info.get('skills', ['Not provided'])[:10])}
-- Experience: {self.candidate_info.get('years_of_experience', 'Not provided')}
-- Recent Role: {self.candidate_info.get('recent_job_title', 'Not provided')} at {self.candidate_info.get('recent_company', 'Not provided')}
-- Education: {self.candidate_info.get('education', 'Not provided')}
-- Key Projects: {', '.join(self.candidate_info.get('key_projects', ['Not provided'])[:2])}
-
-QUESTIONING STRATEGY:
-- Start with 1-2 resume-based questions as warm-up
-- Then move to general role-based questions
-- Balance: 40% resume-specific, 60% role-based questions
-- Ask scenarios, technical knowledge, problem-solving approaches
-- Don't over-focus on their specific projects"""
-
-        system_prompt = f"""You are Alex, a professional interviewer conducting a {self.role} interview.
-
-INTERVIEW DURATION: {self.duration_minutes} minutes
+INTERVIEW DURATION: {duration_minutes} minutes
 ROLE FOCUS AREAS: {focus_areas}
 
-{resume_context}
-
 CRITICAL: QUESTION BALANCE AND VARIETY
 You MUST ask a mix of different question types based on the role:
 
@@ -112,16 +92,110 @@ INTERVIEWING STYLE:
 5. Probe deeper if answers are vague
 6. Keep questions realistic and practical
 7. NO markdown formatting in responses
-8. Be professional but conversational
+8. Be professional but conversational"""
 
-Begin with a greeting using their name ({self.candidate_name}), brief introduction, and your first question."""
 
-        # Start chat with system prompt
-        self.chat = self.model.start_chat(history=[])
+class InterviewAgent:
+    def __init__(self, role, duration_minutes, candidate_info=None, resume_text=None):
+        self._init_state(role, duration_minutes, candidate_info, resume_text)
         
-        # Send system prompt and get first question
-        response = self.chat.send_message(system_prompt)
-        first_question = response.text
+        # Initialize chat session
+        self._initialize_chat()
+    
+    def _init_state(self, role, duration_minutes, candidate_info, resume_text):
+        """Set up interview state without any model calls"""
+        self.role = role
+        self.session_id = uuid.uuid4().hex  # Token usage is attributed to this id
+        self.token_usage = UsageTotals()
+        self.llm = get_gateway()
+        self.memory = ConversationMemory()
+        self.context = None
+        self.conversation_history = []
+        self.candidate_info = candidate_info or {}
+        self.resume_text = resume_text
+        self.candidate_name = candidate_info.get('name', 'Candidate') if candidate_info else 'Candidate'
+        
+        # Time management
+        self.duration_minutes = duration_minutes
+        self.start_time = None
+        self.end_time = None
+        self.is_final_question = False
+        self.interview_ended = False
+        
+        # User behavior tracking
+        self.off_topic_count = 0
+        self.confusion_indicators = 0
+        self.silence_count = 0
+        self.user_requested_exit = False
+        
+        # Closings are prepared ahead of time so ending the interview never waits on the model
+        self.prepared_closings = {}  # kind -> Future of a generated closing
+        self.prefetch_closings = True  # Off for agents rebuilt per request - nothing would wait for the result
+        self.speech_prewarm = None  # Optional callable(text) that caches a closing's audio
+        
+    def _initialize_chat(self):
+        """Initialize Gemini chat session with time-aware system prompt"""
+        # Role/duration instructions are built once and shared by every candidate
+        self.context = self.llm.get_context(*self._context_spec())
+        candidate_prompt = self._build_candidate_prompt()
+        
+        # Send candidate-specific prompt on top of the shared instructions and get first question
+        first_question = self.llm.start_chat(context=self.context, usage=self._usage("opening", "interview.opening")).send_message(candidate_prompt)
+        
+        return self._record_opening(candidate_prompt, first_question)
+    
+    def _usage(self, phase, call_site):
+        """Usage tag that bills a model call to this interview"""
+        return UsageTag(self.session_id, phase, call_site, self.token_usage)
+    
+    def budget_state(self):
+        """BUDGET_OK, BUDGET_TIGHT or BUDGET_EXHAUSTED for this interview's token budget"""
+        return self.token_usage.budget_state()
+    
+    def _fallback_question(self):
+        """Next question without the model - the role's common questions not yet asked, in order"""
+        asked = " ".join(msg["content"] for msg in self.conversation_history if msg["role"] == "assistant")
+        questions = INTERVIEW_ROLES.get(self.role, {}).get("common_questions", [])
+        question = next((q for q in questions if q not in asked),
+                        f"Tell me about another experience that shows why you'd be a good fit for this {self.role} role")
+        lead_in = "We're almost out of time, so one final question." if self.is_final_question else "Thank you, that's helpful."
+        return f"{lead_in} {question if question.endswith('?') else question + '.'}"
+    
+    def _context_spec(self):
+        """Key and instructions for the role/duration prompt prefix"""
+        return f"interview:{self.role}:{self.duration_minutes}", build_interview_instructions(self.role, self.duration_minutes)
+    
+    def _build_candidate_prompt(self):
+        """Candidate-specific opening prompt sent on top of the shared instructions"""
+        # Build resume context if available
+        resume_context = ""
+        if self.candidate_info:
+            resume_context = f"""
+
+CANDIDATE BACKGROUND:
+- Name: {self.candidate_info.get('name', 'Not provided')}
+- Skills: {', '.join(self.candidate_info.get('skills', ['Not provided'])[:10])}
+- Experience: {self.candidate_info.get('years_of_experience', 'Not provided')}
+- Recent Role: {self.candidate_info.get('recent_job_title', 'Not provided')} at {self.candidate_info.get('recent_company', 'Not provided')}
+- Education: {self.candidate_info.get('education', 'Not provided')}
+- Key Projects: {', '.join(self.candidate_info.get('key_projects', ['Not provided'])[:2])}
+
+QUESTIONING STRATEGY:
+- Start with 1-2 resume-based questions as warm-up
+- Then move to general role-based questions
+- Balance: 40% resume-specific, 60% role-based questions
+- Ask scenarios, technical knowledge, problem-solving approaches
+- Don't over-focus on their specific projects"""
+
+        candidate_prompt = f"""{resume_context.strip()}
+
+Begin with a greeting using their name ({self.candidate_name}), brief introduction, and your first question.""".strip()
+        return candidate_prompt
+    
+    def _record_opening(self, candidate_prompt, first_question):
+        """Store the opening question - returns it"""
+        # Pin the prompt in memory - later turns are rebuilt from it instead of a growing chat log
+        self.memory.set_instructions(candidate_prompt, first_question)
         
         # Store in conversation history
         self.conversation_history.append({
@@ -154,57 +228,15 @@ Begin with a greeting using their name ({self.candidate_name}), brief introducti
     
     def _detect_user_exit_request(self, user_response):
         """Detect if user wants to end interview early"""
-        exit_keywords = [
-            'end interview', 'stop interview', 'finish interview', 'quit', 
-            'want to stop', 'want to end', 'need to leave', 'have to go', 'end this',
-            "that's all", 'no more questions', "i'm done", 'terminate', 'stop this'
-        ]
-        response_lower = user_response.lower().strip()
-        
-        for keyword in exit_keywords:
-            if keyword in response_lower:
-                return True
-        return False
+        return detect_behavior(user_response).wants_exit
     
     def _detect_off_topic(self, user_response):
         """Detect if user is going off-topic or being chatty"""
-        off_topic_indicators = [
-            'by the way', 'speaking of', 'reminds me of', 'fun fact',
-            'also wanted to mention', 'changing the subject', 'random thought',
-            'off topic but', 'not related but'
-        ]
-        
-        response_lower = user_response.lower()
-        for indicator in off_topic_indicators:
-            if indicator in response_lower:
-                return True
-        
-        # Check for excessive length (chatty user)
-        if len(user_response.split()) > 200:  # More than 200 words
-            return True
-        
-        return False
+        return detect_behavior(user_response).off_topic
     
     def _detect_confusion(self, user_response):
         """Detect if user is confused or unsure"""
-        confusion_indicators = [
-            "i don't understand", "i'm confused", "not sure what you mean",
-            "can you clarify", "what do you mean by", "i'm not following",
-            "could you explain", "i don't know", "i'm unsure", "um", "uh",
-            "i guess", "maybe", "i think maybe", "not sure", "confused about"
-        ]
-        
-        response_lower = user_response.lower()
-        for indicator in confusion_indicators:
-            if indicator in response_lower:
-                return True
-        
-        # Check for very short, vague answers
-        word_count = len(user_response.split())
-        if word_count < 10 and any(word in response_lower for word in ['maybe', 'guess', 'think', 'not sure']):
-            return True
-        
-        return False
+        return detect_behavior(user_response).confused
     
     def _handle_silence(self):
         """Generate helpful response when user is silent for too long"""
@@ -225,16 +257,60 @@ Begin with a greeting using their name ({self.candidate_name}), brief introducti
     
     def get_next_question(self, user_response):
         """Generate next question with behavior detection and adaptive responses"""
+        return "".join(self.get_next_question_stream(user_response))
+    
+    def get_next_question_stream(self, user_response):
+        """Same as get_next_question, but yields the reply in text chunks as they are generated.
+        The complete reply is added to conversation_history once the stream is exhausted."""
+        reply, prompt = self._prepare_turn(user_response)
+        if reply is not None:
+            yield reply
+            return
+        
+        # Stream AI response
+        chunks = []
+        for chunk in self._chat_session().send_message_stream(prompt):
+            chunks.append(chunk)
+            yield chunk
+        
+        self._finish_turn(user_response, "".join(chunks))
+    
+    def _finish_turn(self, user_response, assistant_message):
+        """Store the assistant response for the transcript and for model memory"""
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": assistant_message
+        })
+        self.memory.add_turn(user_response, assistant_message)
+    
+    def _chat_session(self):
+        """Chat session over the token-budgeted memory (instructions, summary, recent turns)"""
+        return self.llm.start_chat(history=self.memory.build_history(), context=self._chat_context(),
+                                   usage=self._usage("turn", "interview.next_question"))
+    
+    def _chat_context(self):
+        """Shared role/duration instructions - looked up again on demand after rehydration"""
+        if self.context is None:
+            self.context = self.llm.get_context(*self._context_spec())
+        return self.context
+    
+    def _prepare_turn(self, user_response):
+        """Record the answer and decide how to respond.
+        Returns (reply, None) when the reply is already known, or (None, prompt) for the LLM.
+        The LLM reply must then be passed to _finish_turn."""
         
         # Handle empty/silence
         if not user_response or user_response.strip() == "":
-            return self._handle_silence()
+            return self._handle_silence(), None
         
         # Reset silence count if user responds
         self.silence_count = 0
         
+        # Classify the answer once - exit, off-topic and confusion signals together
+        signals = detect_behavior(user_response)
+        
         # CRITICAL: CHECK FOR EARLY EXIT REQUEST FIRST (before time check)
-        if self._detect_user_exit_request(user_response):
+        if signals.wants_exit:
             self.user_requested_exit = True
             self.interview_ended = True  # Mark as ended immediately
             
@@ -243,7 +319,7 @@ Begin with a greeting using their name ({self.candidate_name}), brief introducti
                 "content": user_response
             })
             
-            closing = self._generate_early_exit_closing()
+            closing = self.closing_text("early_exit")
             
             self.conversation_history.append({
                 "role": "assistant",
@@ -251,7 +327,7 @@ Begin with a greeting using their name ({self.candidate_name}), brief introducti
             })
             
             # Return closing - interview will end on next rerun
-            return closing
+            return closing, None
         
         # CHECK TIME - Interrupt if time is up
         remaining = self.get_time_remaining()
@@ -263,14 +339,14 @@ Begin with a greeting using their name ({self.candidate_name}), brief introducti
                 "content": user_response
             })
             
-            closing = self._generate_interrupting_closing()
+            closing = self.closing_text("time_up")
             
             self.conversation_history.append({
                 "role": "assistant",
                 "content": closing
             })
             
-            return closing
+            return closing, None
         
         # Store user response
         self.conversation_history.append({
@@ -279,8 +355,8 @@ Begin with a greeting using their name ({self.candidate_name}), brief introducti
         })
         
         # DETECT USER BEHAVIOR PATTERNS
-        is_off_topic = self._detect_off_topic(user_response)
-        is_confused = self._detect_confusion(user_response)
+        is_off_topic = signals.off_topic
+        is_confused = signals.confused
         
         if is_off_topic:
             self.off_topic_count += 1
@@ -329,9 +405,23 @@ IMPORTANT: The candidate keeps going off-topic (chatty user).
 Example: "I appreciate the context, but let's focus on the interview. Here's a quick question..."
 """
         
+        # Over the token budget: keep the interview going with local questions
+        budget = self.budget_state()
+        if budget == BUDGET_EXHAUSTED:
+            if self.should_ask_final_question():
+                self.is_final_question = True
+            reply = self._fallback_question()
+            self._finish_turn(user_response, reply)
+            return reply, None
+        if budget == BUDGET_TIGHT:
+            # Near the budget: send less history per turn
+            self.memory.set_budget(min(self.memory.max_recent_turns, BUDGET_TIGHT_MEMORY_TURNS),
+                                   min(self.memory.token_budget, MEMORY_TOKEN_BUDGET // 2))
+        
         # Check if we should ask the final question (1 minute remaining)
         if self.should_ask_final_question() and not self.is_final_question:
             self.is_final_question = True
+            self.prepare_closings()
             prompt = f"""Candidate's response: "{user_response}"
 
 TIME ALERT: About 1 minute remaining in the interview.
@@ -363,40 +453,51 @@ Remember:
 
 Your next question:"""
         
-        # Get AI response
-        response = self.chat.send_message(prompt)
-        assistant_message = response.text
+        return None, prompt
+    
+    def closing_text(self, kind):
+        """Closing for kind ("early_exit", "time_up" or "completed") without waiting on the model:
+        the background-generated closing if it is ready, otherwise the personalized template"""
+        prepared = self.prepared_closings.get(kind)
+        if prepared and prepared.done() and not prepared.exception():
+            return prepared.result()
+        return CLOSING_TEMPLATES[kind].format(name=self.candidate_name, role=self.role)
+    
+    def prepare_closings(self):
+        """Generate natural closings in the background - called when the final question is asked"""
+        if not self.prefetch_closings or self.budget_state() != BUDGET_OK:
+            return  # The templates will do
+        history = self.memory.build_history()
+        for kind, prompt in (("time_up", self._interrupting_closing_prompt()), ("completed", self._closing_message_prompt())):
+            if kind not in self.prepared_closings:
+                self.prepared_closings[kind] = _get_closing_executor().submit(self._generate_closing, history, prompt)
+    
+    def _generate_closing(self, history, prompt):
+        closing = self.llm.start_chat(history=history, context=self._chat_context(),
+                                      usage=self._usage("closing", "interview.closing")).send_message(prompt)
+        if self.speech_prewarm:
+            self.speech_prewarm(closing)
+        return closing
+    
+    def enable_closing_audio(self, speech_prewarm):
+        """Cache closing audio ahead of time with speech_prewarm(text) - templates now, generated closings when ready"""
+        self.speech_prewarm = speech_prewarm
+        for kind in CLOSING_TEMPLATES:
+            _get_closing_executor().submit(speech_prewarm, self.closing_text(kind))
+    
+    def _generate_closing_message(self):
+        """Generate interview closing message"""
+        closing = self.closing_text("completed")
         
-        # Store assistant response
         self.conversation_history.append({
             "role": "assistant",
-            "content": assistant_message
+            "content": closing
         })
         
-        return assistant_message
-    
-    def _generate_early_exit_closing(self):
-        """Generate closing message when user requests to end early"""
-        prompt = f"""The candidate ({self.candidate_name}) has requested to end the interview early.
-
-Generate a professional and understanding response:
-1. Acknowledge their request respectfully
-2. Thank them for their time so far
-3. Let them know they'll still receive feedback
-4. Keep it warm and professional (2-3 sentences)
-
-Example tone: "I completely understand, {self.candidate_name}. Thank you for your time today - I appreciate the insights you've shared. You'll receive feedback on the portion we completed shortly. Best of luck with your job search!"
-
-NO markdown formatting - speak naturally."""
-        
-        response = self.chat.send_message(prompt)
-        closing = response.text
-        
         return closing
     
-    def _generate_closing_message(self):
-        """Generate interview closing message"""
-        prompt = f"""The interview has concluded. 
+    def _closing_message_prompt(self):
+        return f"""The interview has concluded. 
 
 Thank {self.candidate_name} warmly for their time and participation. 
 Let them know they'll receive detailed feedback shortly.
@@ -404,20 +505,9 @@ Express appreciation for their thoughtful responses.
 
 Keep it brief (2-3 sentences), professional, and encouraging.
 No markdown formatting - speak naturally."""
-        
-        response = self.chat.send_message(prompt)
-        closing = response.text
-        
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": closing
-        })
-        
-        return closing
     
-    def _generate_interrupting_closing(self):
-        """Generate interrupting closing message when time runs out"""
-        prompt = f"""CRITICAL: The interview time has just run out while {self.candidate_name} was speaking.
+    def _interrupting_closing_prompt(self):
+        return f"""CRITICAL: The interview time has just run out while {self.candidate_name} was speaking.
 
 You need to INTERRUPT politely and professionally:
 
@@ -430,10 +520,11 @@ Example tone: "I'm sorry to interrupt you, but our time has concluded. Thank you
 
 Keep it brief (2-3 sentences), professional, and warm.
 NO markdown formatting - speak naturally as an interviewer would."""
-        
-        response = self.chat.send_message(prompt)
-        closing = response.text
-        
+    
+    def end_interview(self):
+        """End the interview now - returns the (prepared) closing message"""
+        closing = self._generate_closing_message()
+        self.interview_ended = True
         return closing
     
     def is_interview_complete(self):
@@ -448,12 +539,126 @@ NO markdown formatting - speak naturally as an interviewer would."""
                 "off_topic_count": self.off_topic_count,
                 "confusion_indicators": self.confusion_indicators,
                 "user_requested_exit": self.user_requested_exit,
-                "interview_duration_used": (datetime.now() - self.start_time).total_seconds() / 60 if self.start_time else 0
+                "interview_duration_used": (datetime.now() - self.start_time).total_seconds() / 60 if self.start_time else 0,
+                "answer_metrics": compute_answer_metrics(self.conversation_history)
             }
         }
     
+    def feedback_usage(self):
+        """Usage tag for FeedbackGenerator - its calls are added to this interview's totals and budget"""
+        return self._usage("feedback", "feedback")
+    
+    def to_dict(self, closing_timeout=0):
+        """JSON-serializable snapshot of the interview - history, memory, counters, timers and flags.
+        Model state is not included; from_dict rebuilds it lazily on the next model call.
+        Closings still being generated are waited for up to closing_timeout seconds, then left out."""
+        pending = [prepared for prepared in self.prepared_closings.values() if isinstance(prepared, Future)]
+        if closing_timeout and pending:
+            wait(pending, timeout=closing_timeout)
+        return {
+            "session_id": self.session_id,
+            "token_usage": self.token_usage.to_dict(),
+            "role": self.role,
+            "duration_minutes": self.duration_minutes,
+            "candidate_info": self.candidate_info,
+            "resume_text": self.resume_text,
+            "conversation_history": self.conversation_history,
+            "memory": self.memory.to_dict(),
+            "start_time": self.start_time.isoformat() if self.start_time else None,
+            "end_time": self.end_time.isoformat() if self.end_time else None,
+            "is_final_question": self.is_final_question,
+            "interview_ended": self.interview_ended,
+            "off_topic_count": self.off_topic_count,
+            "confusion_indicators": self.confusion_indicators,
+            "silence_count": self.silence_count,
+            "user_requested_exit": self.user_requested_exit,
+            "closings": {
+                kind: prepared.result() for kind, prepared in self.prepared_closings.items()
+                if prepared.done() and not prepared.exception()
+            },
+        }
+    
+    @classmethod
+    def from_dict(cls, data, prefetch_closings=True):
+        """Rebuild an agent from to_dict() output without any model call.
+        Pass prefetch_closings=False when the agent only lives for one request."""
+        agent = cls.__new__(cls)
+        agent._init_state(data["role"], data["duration_minutes"], data["candidate_info"], data["resume_text"])
+        agent.prefetch_closings = prefetch_closings
+        agent.session_id = data.get("session_id") or agent.session_id
+        agent.token_usage = UsageTotals.from_dict(data.get("token_usage"))
+        agent.conversation_history = data["conversation_history"]
+        agent.memory = ConversationMemory.from_dict(data["memory"])
+        agent.start_time = datetime.fromisoformat(data["start_time"]) if data["start_time"] else None
+        agent.end_time = datetime.fromisoformat(data["end_time"]) if data["end_time"] else None
+        for key in ("is_final_question", "interview_ended", "off_topic_count", "confusion_indicators",
+                    "silence_count", "user_requested_exit"):
+            setattr(agent, key, data[key])
+        for kind, closing in data.get("closings", {}).items():
+            prepared = Future()
+            prepared.set_result(closing)
+            agent.prepared_closings[kind] = prepared
+        return agent
+    
     def get_first_question(self):
         """Get the first question (already generated during initialization)"""
         if self.conversation_history:
             return self.conversation_history[0]["content"]
-        return f"Hello {self.candidate_name}! Let's begin the interview."
\ No newline at end of file
+        return f"Hello {self.candidate_name}! Let's begin the interview."
+
+
+class AsyncInterviewAgent(InterviewAgent):
+    """
+    Async counterpart of InterviewAgent - model calls are awaited instead of blocking,
+    so many interview sessions can share one event loop.
+    Same state, prompts and behavior handling as the sync agent.
+
+        agent = AsyncInterviewAgent(role, duration_minutes, candidate_info, resume_text)
+        first_question = await agent.start()
+        reply = await agent.next_question(answer)
+        closing = await agent.close()
+    """
+    
+    def __init__(self, role, duration_minutes, candidate_info=None, resume_text=None):
+        # No model call here - the opening question is generated by start()
+        self._init_state(role, duration_minutes, candidate_info, resume_text)
+    
+    async def start(self):
+        """Generate the opening question and start the interview timer - returns the first question"""
+        self.context = self.llm.get_context(*self._context_spec())
+        candidate_prompt = self._build_candidate_prompt()
+        first_question = await self.llm.start_chat(context=self.context, usage=self._usage("opening", "interview.opening")).send_message_async(candidate_prompt)
+        self._record_opening(candidate_prompt, first_question)
+        self.start_interview()
+        return first_question
+    
+    async def next_question(self, user_response):
+        """Async version of get_next_question"""
+        reply, prompt = self._prepare_turn(user_response)
+        if reply is not None:
+            return reply
+        
+        assistant_message = await self._chat_session().send_message_async(prompt)
+        self._finish_turn(user_response, assistant_message)
+        return assistant_message
+    
+    def prepare_closings(self):
+        """Generate natural closings as tasks on the running event loop instead of the closing thread pool"""
+        if not self.prefetch_closings or self.budget_state() != BUDGET_OK:
+            return
+        loop = asyncio.get_running_loop()
+        history = self.memory.build_history()
+        for kind, prompt in (("time_up", self._interrupting_closing_prompt()), ("completed", self._closing_message_prompt())):
+            if kind not in self.prepared_closings:
+                self.prepared_closings[kind] = loop.create_task(self._generate_closing_async(history, prompt))
+    
+    async def _generate_closing_async(self, history, prompt):
+        closing = await self.llm.start_chat(history=history, context=self._chat_context(),
+                                            usage=self._usage("closing", "interview.closing")).send_message_async(prompt)
+        if self.speech_prewarm:
+            await asyncio.to_thread(self.speech_prewarm, closing)
+        return closing
+    
+    async def close(self):
+        """End the interview with the prepared closing message"""
+        return self.end_interview()
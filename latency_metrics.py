@@ -0,0 +1,184 @@
+import bisect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from config import LATENCY_BUCKETS_SECONDS, LATENCY_RECENT_TURNS
+
+METRIC_NAME = "interview_stage_seconds"
+
+# Stages timed around each turn, in the order they happen, with short display labels
+STAGES = {
+    "listen": "Listen",              # Speech recognition of the answer
+    "llm_first_token": "LLM 1st",    # Model reply, first chunk
+    "llm_reply": "LLM",              # Model reply, complete
+    "tts": "TTS",                    # Speech synthesis still pending once the reply is shown
+    "audio_encode": "Audio",         # Audio playback setup (registering clips with the media endpoint)
+    "rerun": "Rerun",                # Streamlit rerun that renders the turn
+}
+
+
+class _Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def cumulative(self):
+        running, result = 0, []
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+
+class LatencyRecorder:
+    """
+    Timing spans for the stages of a turn, tagged with session and turn number.
+    Each stage feeds a histogram (for Prometheus text or JSON export); the spans of
+    the most recent turns are kept per session for a turn-by-turn breakdown.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS_SECONDS, recent_turns=LATENCY_RECENT_TURNS):
+        self.buckets = tuple(sorted(buckets))
+        self.recent_turns = recent_turns
+        self._histograms = {}
+        self._turns = OrderedDict()  # (session_id, turn) -> {stage: seconds}, oldest first
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage, session_id=None, turn=None):
+        """Time the enclosed block as one stage of a turn"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started, session_id, turn)
+
+    def record(self, stage, seconds, session_id=None, turn=None):
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = _Histogram(self.buckets)
+            histogram.observe(seconds)
+
+            if session_id is None or turn is None:
+                return
+            key = (session_id, turn)
+            spans = self._turns.pop(key, {})
+            # A stage timed twice in one turn (e.g. two audio clips) adds up
+            spans[stage] = spans.get(stage, 0.0) + seconds
+            self._turns[key] = spans
+            while len(self._turns) > self.recent_turns:
+                self._turns.popitem(last=False)
+
+    def turn_breakdown(self, session_id, limit=None):
+        """[(turn, {stage: seconds})] for a session's recent turns, oldest first"""
+        with self._lock:
+            turns = [(turn, dict(spans)) for (sid, turn), spans in self._turns.items() if sid == session_id]
+        turns.sort(key=lambda item: item[0])
+        return turns[-limit:] if limit else turns
+
+    def to_dict(self):
+        """Histograms and recent turn spans as JSON-serializable data"""
+        with self._lock:
+            stages = {
+                stage: {
+                    "count": histogram.count,
+                    "sum_seconds": round(histogram.total, 6),
+                    "mean_seconds": round(histogram.total / histogram.count, 6) if histogram.count else 0.0,
+                    "buckets": [{"le": bound, "count": count} for bound, count in histogram.cumulative()],
+                }
+                for stage, histogram in sorted(self._histograms.items())
+            }
+            turns = [
+                {"session_id": session_id, "turn": turn, "spans": {stage: round(seconds, 6) for stage, seconds in spans.items()}}
+                for (session_id, turn), spans in self._turns.items()
+            ]
+        return {"stages": stages, "recent_turns": turns}
+
+    def to_prometheus(self):
+        """Prometheus text exposition format (one histogram labelled by stage)"""
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in each stage of an interview turn.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self._histograms.items()):
+                for bound, count in histogram.cumulative():
+                    le = bound if bound == "+Inf" else repr(float(bound))
+                    lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="{le}"}} {count}')
+                lines.append(f'{METRIC_NAME}_sum{{stage="{stage}"}} {histogram.total:.6f}')
+                lines.append(f'{METRIC_NAME}_count{{stage="{stage}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write the Prometheus text to path atomically (for a node-exporter textfile collector)"""
+        self._write(path, self.to_prometheus())
+
+    def write_json(self, path):
+        self._write(path, json.dumps(self.to_dict(), indent=2))
+
+    def export(self, path):
+        """JSON for a *.json path, Prometheus text otherwise"""
+        if path.endswith(".json"):
+            self.write_json(path)
+        else:
+            self.write_prometheus(path)
+
+    @staticmethod
+    def _write(path, text):
+        # One temp file per writer - sessions (threads) and worker processes export concurrently
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._turns.clear()
+
+
+_latency_recorder = None
+_latency_recorder_lock = threading.Lock()
+
+
+def get_latency_recorder():
+    """Return the process-wide latency recorder"""
+    global _latency_recorder
+    if _latency_recorder is None:
+        with _latency_recorder_lock:
+            if _latency_recorder is None:
+                _latency_recorder = LatencyRecorder()
+    return _latency_recorder
+
+
+def timed_stream(chunks, stage_first, stage_total, session_id=None, turn=None, recorder=None):
+    """Pass chunks through, recording time to the first chunk and to the end of the stream"""
+    recorder = recorder or get_latency_recorder()
+    started = time.perf_counter()
+    first = True
+    for chunk in chunks:
+        if first:
+            recorder.record(stage_first, time.perf_counter() - started, session_id, turn)
+            first = False
+        yield chunk
+    recorder.record(stage_total, time.perf_counter() - started, session_id, turn)
@@ -0,0 +1,321 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from config import GEMINI_API_KEY, GEMINI_MODEL, LLM_BACKEND, FAKE_LLM_LATENCY, FAKE_LLM_TOKEN_LATENCY
+from conversation_memory import estimate_tokens
+from token_usage import get_usage_ledger
+
+
+def _config_key(generation_config):
+    """Build a hashable key for a generation config dict"""
+    if not generation_config:
+        return None
+    return repr(sorted(generation_config.items()))
+
+
+class GeminiBackend:
+    """Google Gemini backend with pooled model clients"""
+    name = "gemini"
+
+    def __init__(self, api_key=GEMINI_API_KEY, model_name=GEMINI_MODEL):
+        import google.generativeai as genai
+
+        # Configure once per process instead of once per importing module
+        genai.configure(api_key=api_key)
+        self._genai = genai
+        self.model_name = model_name
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def _get_model(self, generation_config=None, context=None):
+        """Return a pooled GenerativeModel so its client connection is reused"""
+        key = (_config_key(generation_config), context.key if context else None)
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                model = self._genai.GenerativeModel(
+                    self.model_name,
+                    system_instruction=context.instructions if context else None,
+                    generation_config=generation_config
+                )
+                self._models[key] = model
+            return model
+
+    def _to_gemini_history(self, history):
+        """Convert repo-style messages to Gemini chat history"""
+        return [
+            {"role": "model" if msg["role"] == "assistant" else "user", "parts": [msg["content"]]}
+            for msg in history
+        ]
+
+    @staticmethod
+    def _report_usage(response, on_usage):
+        """Pass the token counts the service reported to on_usage(prompt_tokens, output_tokens)"""
+        metadata = getattr(response, "usage_metadata", None)
+        if on_usage and metadata:
+            on_usage(metadata.prompt_token_count, metadata.candidates_token_count)
+
+    def generate(self, prompt, generation_config=None, on_usage=None):
+        response = self._get_model(generation_config).generate_content(prompt)
+        self._report_usage(response, on_usage)
+        return response.text
+
+    def chat(self, history, message, generation_config=None, context=None, on_usage=None):
+        session = self._get_model(generation_config, context).start_chat(history=self._to_gemini_history(history))
+        response = session.send_message(message)
+        self._report_usage(response, on_usage)
+        return response.text
+
+    async def generate_async(self, prompt, generation_config=None, on_usage=None):
+        response = await self._get_model(generation_config).generate_content_async(prompt)
+        self._report_usage(response, on_usage)
+        return response.text
+
+    async def chat_async(self, history, message, generation_config=None, context=None, on_usage=None):
+        session = self._get_model(generation_config, context).start_chat(history=self._to_gemini_history(history))
+        response = await session.send_message_async(message)
+        self._report_usage(response, on_usage)
+        return response.text
+
+    def chat_stream(self, history, message, generation_config=None, context=None, on_usage=None):
+        session = self._get_model(generation_config, context).start_chat(history=self._to_gemini_history(history))
+        response = session.send_message(message, stream=True)
+        for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. finish markers) have nothing to show
+                continue
+            if text:
+                yield text
+        # Usage of a streamed reply is known once the last chunk has arrived
+        self._report_usage(response, on_usage)
+
+
+def _fake_from_schema(schema):
+    """Build a minimal value that satisfies a JSON response schema"""
+    schema_type = str(schema.get("type", "string")).lower()
+    if schema_type == "object":
+        return {name: _fake_from_schema(prop) for name, prop in schema.get("properties", {}).items()}
+    if schema_type == "array":
+        return []
+    if schema_type == "boolean":
+        return True
+    if schema_type in ("integer", "number"):
+        return 0
+    return "Not Found"
+
+
+class FakeBackend:
+    """Deterministic offline backend with configurable latency.
+    Reports no token usage - the gateway estimates it from the text."""
+    name = "fake"
+
+    DEFAULT_REPLIES = [
+        "Thanks for sharing that. Could you walk me through a specific example where you applied this?",
+        "That's helpful context. What was the biggest challenge you faced, and how did you handle it?",
+        "Interesting. How did you measure the impact of your work in that situation?",
+        "Good. If you had to do it again, what would you change about your approach?",
+        "I appreciate the detail. How did you collaborate with your team to get that done?",
+    ]
+
+    def __init__(self, latency=FAKE_LLM_LATENCY, token_latency=FAKE_LLM_TOKEN_LATENCY, responder=None):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.responder = responder
+        self.call_count = 0
+        self._lock = threading.Lock()
+
+    def _reply(self, prompt, history, generation_config=None):
+        """Compute the deterministic reply (no simulated latency)"""
+        with self._lock:
+            self.call_count += 1
+        schema = (generation_config or {}).get("response_schema")
+        if self.responder:
+            return self.responder(prompt, history)
+        if schema:
+            return json.dumps(_fake_from_schema(schema))
+        digest = hashlib.sha256(f"{len(history)}:{prompt}".encode("utf-8")).digest()
+        return self.DEFAULT_REPLIES[digest[0] % len(self.DEFAULT_REPLIES)]
+
+    def _total_latency(self, reply):
+        return self.latency + self.token_latency * len(reply.split())
+
+    def generate(self, prompt, generation_config=None, on_usage=None):
+        reply = self._reply(prompt, [], generation_config)
+        time.sleep(self._total_latency(reply))
+        return reply
+
+    async def generate_async(self, prompt, generation_config=None, on_usage=None):
+        reply = self._reply(prompt, [], generation_config)
+        await asyncio.sleep(self._total_latency(reply))
+        return reply
+
+    def chat(self, history, message, generation_config=None, context=None, on_usage=None):
+        reply = self._reply(message, history, generation_config)
+        time.sleep(self._total_latency(reply))
+        return reply
+
+    async def chat_async(self, history, message, generation_config=None, context=None, on_usage=None):
+        reply = self._reply(message, history, generation_config)
+        await asyncio.sleep(self._total_latency(reply))
+        return reply
+
+    def chat_stream(self, history, message, generation_config=None, context=None, on_usage=None):
+        words = self._reply(message, history, generation_config).split(" ")
+        if self.latency > 0:
+            time.sleep(self.latency)
+        for i, word in enumerate(words):
+            if i and self.token_latency > 0:
+                time.sleep(self.token_latency)
+            yield word if i == 0 else " " + word
+
+
+class SharedContext:
+    """Instruction prefix built once and shared by every chat with the same key - sent as the system instruction"""
+
+    def __init__(self, key, instructions):
+        self.key = key
+        self.instructions = instructions
+        self.tokens = estimate_tokens(instructions)  # For usage estimates
+
+
+class _UsageMeter:
+    """Token usage of one model call - as reported by the backend, otherwise estimated from the text"""
+
+    def __init__(self, usage, estimated_prompt_tokens):
+        self.usage = usage
+        self.estimated_prompt_tokens = estimated_prompt_tokens
+        self.reported = None
+
+    def __call__(self, prompt_tokens, output_tokens):
+        self.reported = (prompt_tokens or 0, output_tokens or 0)
+
+    def finish(self, reply):
+        prompt_tokens, output_tokens = self.reported or (self.estimated_prompt_tokens, estimate_tokens(reply))
+        get_usage_ledger().record(self.usage, prompt_tokens, output_tokens)
+
+
+class ChatSession:
+    """Multi-turn conversation held by the gateway on top of a stateless backend"""
+
+    def __init__(self, gateway, history=None, generation_config=None, context=None, usage=None):
+        self._gateway = gateway
+        self.history = list(history or [])
+        self.generation_config = generation_config
+        self.context = context
+        self.usage = usage
+
+    def _meter(self, message):
+        prompt_tokens = sum(estimate_tokens(msg["content"]) for msg in self.history) + estimate_tokens(message)
+        if self.context:
+            prompt_tokens += self.context.tokens
+        return _UsageMeter(self.usage, prompt_tokens)
+
+    def send_message(self, message):
+        """Send a message and return the reply text"""
+        meter = self._meter(message)
+        reply = self._gateway.backend.chat(self.history, message, self.generation_config, self.context, on_usage=meter)
+        meter.finish(reply)
+        self.history.append({"role": "user", "content": message})
+        self.history.append({"role": "assistant", "content": reply})
+        return reply
+
+    async def send_message_async(self, message):
+        """Async send_message - awaits the reply without blocking the event loop"""
+        meter = self._meter(message)
+        reply = await self._gateway.backend.chat_async(self.history, message, self.generation_config, self.context,
+                                                       on_usage=meter)
+        meter.finish(reply)
+        self.history.append({"role": "user", "content": message})
+        self.history.append({"role": "assistant", "content": reply})
+        return reply
+
+    def send_message_stream(self, message):
+        """Send a message and yield reply text chunks as they arrive"""
+        meter = self._meter(message)
+        chunks = []
+        for chunk in self._gateway.backend.chat_stream(self.history, message, self.generation_config, self.context,
+                                                       on_usage=meter):
+            chunks.append(chunk)
+            yield chunk
+        reply = "".join(chunks)
+        meter.finish(reply)
+        self.history.append({"role": "user", "content": message})
+        self.history.append({"role": "assistant", "content": reply})
+
+
+class LLMGateway:
+    """Single entry point for all model calls in the app"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._contexts = {}
+        self._contexts_lock = threading.Lock()
+
+    def use_backend(self, backend):
+        """Switch backends"""
+        self.backend = backend
+
+    def generate(self, prompt, generation_config=None, usage=None):
+        """One-shot generation - returns the reply text. usage (a token_usage.UsageTag) attributes its tokens."""
+        meter = _UsageMeter(usage, estimate_tokens(prompt))
+        reply = self.backend.generate(prompt, generation_config, on_usage=meter)
+        meter.finish(reply)
+        return reply
+
+    async def generate_async(self, prompt, generation_config=None, usage=None):
+        """Async one-shot generation - returns the reply text"""
+        meter = _UsageMeter(usage, estimate_tokens(prompt))
+        reply = await self.backend.generate_async(prompt, generation_config, on_usage=meter)
+        meter.finish(reply)
+        return reply
+
+    def start_chat(self, history=None, generation_config=None, context=None, usage=None):
+        """Start a chat session - returns a ChatSession whose calls are attributed to usage"""
+        return ChatSession(self, history=history, generation_config=generation_config, context=context, usage=usage)
+
+    def get_context(self, key, instructions):
+        """Return the SharedContext for instructions - one per key, so chats sharing it share a pooled model"""
+        key = f"{key}:{hashlib.sha256(instructions.encode('utf-8')).hexdigest()[:16]}"
+        with self._contexts_lock:
+            context = self._contexts.get(key)
+            if context is None:
+                context = self._contexts[key] = SharedContext(key, instructions)
+            return context
+
+
+def create_backend(name=LLM_BACKEND):
+    """Create a backend by name"""
+    if name == "fake":
+        return FakeBackend()
+    if name == "gemini":
+        return GeminiBackend()
+    raise ValueError(f"Unknown LLM backend: {name}")
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    """Return the process-wide gateway, creating it on first use"""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = LLMGateway(create_backend())
+    return _gateway
+
+
+def set_backend(backend):
+    """Swap the backend used by the process-wide gateway (e.g. FakeBackend for offline runs)"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway(backend)
+        else:
+            _gateway.use_backend(backend)
+    return _gateway
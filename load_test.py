@@ -0,0 +1,187 @@
+"""
+Load test for the interview pipeline.
+
+Runs many simulated candidates at once against a fake model with configurable
+latency: each session starts an AsyncInterviewAgent, answers from a scripted
+persona, ends the interview and generates feedback.
+
+    python load_test.py --sessions 200 --concurrency 50 --latency 0.5 --token-latency 0.01
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+import tracemalloc
+import numpy as np
+from config import INTERVIEW_ROLES
+from llm_gateway import FakeBackend, set_backend
+from interview_logic import AsyncInterviewAgent
+from feedback_generator import FeedbackGenerator
+
+# Scripted answers for the personas FeedbackGenerator recognizes
+PERSONAS = {
+    "efficient": [
+        "At my last job our checkout API was slow. I profiled it, added a Redis cache and cut p95 latency by 40% for 2 million users.",
+        "I was responsible for the data migration. I planned it in three phases, wrote rollback scripts and we finished a week early.",
+        "When two teammates disagreed on the design, I set up a short review with both options and we picked one based on the load tests.",
+        "I would start by clarifying the requirements, then sketch the data model and the read and write paths before choosing storage.",
+        "The result was a 25% drop in support tickets, and the approach became our team's standard.",
+    ],
+    "chatty": [
+        "So this reminds me of a project I did years ago, by the way I also love hiking, " + "and we went through a lot of different stages and a lot of different ideas that came up along the way " * 12,
+        "Speaking of teamwork, fun fact, my first manager was a chess champion and " + "we talked about strategy a lot over lunch and how that applies to software and to life in general " * 12,
+        "Random thought but I think the most important thing is communication, " + "which is something I learned from many experiences in many different jobs and also from my family " * 12,
+        "Changing the subject a bit, I also wanted to mention my side projects, " + "which include a blog, a podcast, a small game and a few open source libraries that I maintain " * 12,
+    ],
+    "confused": [
+        "I'm confused, what do you mean by that?",
+        "Um, I don't understand the question.",
+        "I guess maybe it depends? I'm not sure.",
+        "Could you explain that again? I'm not following.",
+        "I don't know, maybe I would ask someone.",
+    ],
+    "early_exit": [
+        "I worked on a reporting dashboard with Python and SQL.",
+        "I'm not sure, I think I would test it first.",
+        "Sorry, I need to leave, I want to end interview.",
+    ],
+}
+
+SAMPLE_CANDIDATE = {
+    "name": "Load Test",
+    "skills": ["Python", "SQL", "Communication"],
+    "years_of_experience": "3 years",
+    "recent_job_title": "Engineer",
+    "recent_company": "Example Corp",
+    "education": "BSc",
+    "key_projects": ["Checkout API", "Data migration"],
+}
+
+
+class LoadTest:
+    def __init__(self, sessions, concurrency, duration_minutes=15, think_time=0.0, with_feedback=True):
+        self.sessions = sessions
+        self.concurrency = concurrency
+        self.duration_minutes = duration_minutes
+        self.think_time = think_time
+        self.with_feedback = with_feedback
+        self.turn_latencies = []
+        self.start_latencies = []
+        self.feedback_latencies = []
+        self.errors = []
+        self.persona_counts = {persona: 0 for persona in PERSONAS}
+        self._active = 0
+        self.peak_active = 0
+
+    async def run(self):
+        slots = asyncio.Semaphore(self.concurrency)
+        personas = itertools.cycle(PERSONAS)
+        roles = itertools.cycle(INTERVIEW_ROLES)
+
+        async def limited(persona, role):
+            async with slots:
+                await self._session(persona, role)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        await asyncio.gather(*(limited(next(personas), next(roles)) for _ in range(self.sessions)))
+        elapsed = time.perf_counter() - started
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return self._report(elapsed, peak_bytes)
+
+    async def _session(self, persona, role):
+        self._active += 1
+        self.peak_active = max(self.peak_active, self._active)
+        try:
+            agent = AsyncInterviewAgent(role, self.duration_minutes, SAMPLE_CANDIDATE, resume_text=None)
+            t = time.perf_counter()
+            await agent.start()
+            self.start_latencies.append(time.perf_counter() - t)
+
+            for answer in PERSONAS[persona]:
+                if self.think_time:
+                    await asyncio.sleep(self.think_time)
+                t = time.perf_counter()
+                await agent.next_question(answer)
+                self.turn_latencies.append(time.perf_counter() - t)
+                if agent.is_interview_complete():
+                    break
+            if not agent.is_interview_complete():
+                await agent.close()
+
+            if self.with_feedback:
+                t = time.perf_counter()
+                feedback_gen = FeedbackGenerator(role, agent.get_conversation_history(), candidate_info=SAMPLE_CANDIDATE,
+                                                 usage=agent.feedback_usage())
+                await asyncio.to_thread(feedback_gen.generate_feedback)
+                self.feedback_latencies.append(time.perf_counter() - t)
+            self.persona_counts[persona] += 1
+        except Exception as e:
+            self.errors.append(f"{persona}: {e}")
+        finally:
+            self._active -= 1
+
+    def _report(self, elapsed, peak_bytes):
+        def percentiles(samples):
+            if not samples:
+                return {"count": 0}
+            values = np.array(samples) * 1000
+            return {
+                "count": len(samples),
+                "p50_ms": round(float(np.percentile(values, 50)), 1),
+                "p95_ms": round(float(np.percentile(values, 95)), 1),
+                "p99_ms": round(float(np.percentile(values, 99)), 1),
+                "max_ms": round(float(values.max()), 1),
+            }
+
+        completed = sum(self.persona_counts.values())
+        return {
+            "sessions": self.sessions,
+            "completed": completed,
+            "errors": len(self.errors),
+            "concurrency": self.concurrency,
+            "elapsed_seconds": round(elapsed, 2),
+            "sessions_per_second": round(completed / elapsed, 2) if elapsed > 0 else 0.0,
+            "turn_latency": percentiles(self.turn_latencies),
+            "start_latency": percentiles(self.start_latencies),
+            "feedback_latency": percentiles(self.feedback_latencies),
+            "peak_traced_memory_mb": round(peak_bytes / 2 ** 20, 2),
+            "peak_memory_per_session_kb": round(peak_bytes / max(self.peak_active, 1) / 1024, 1),
+            "personas": self.persona_counts,
+        }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Drive many simulated interviews against a fake model")
+    arg_parser.add_argument("--sessions", type=int, default=100, help="Interviews to run")
+    arg_parser.add_argument("--concurrency", type=int, default=25, help="Interviews in flight at once")
+    arg_parser.add_argument("--latency", type=float, default=0.3, help="Fake model seconds per call")
+    arg_parser.add_argument("--token-latency", type=float, default=0.0, help="Fake model seconds per generated word")
+    arg_parser.add_argument("--think-time", type=float, default=0.0, help="Seconds a candidate waits before each answer")
+    arg_parser.add_argument("--duration", type=int, default=15, help="Interview duration in minutes")
+    arg_parser.add_argument("--no-feedback", action="store_true", help="Skip feedback generation")
+    arg_parser.add_argument("--json", help="Also write the report to this file")
+    args = arg_parser.parse_args()
+
+    set_backend(FakeBackend(latency=args.latency, token_latency=args.token_latency))
+    load_test = LoadTest(args.sessions, args.concurrency, duration_minutes=args.duration,
+                         think_time=args.think_time, with_feedback=not args.no_feedback)
+    report = asyncio.run(load_test.run())
+
+    print("=" * 50)
+    print("Load test report:")
+    print("=" * 50)
+    for key, value in report.items():
+        print(f"{key:>28}: {value}")
+    for error in load_test.errors[:5]:
+        print(f"error: {error}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
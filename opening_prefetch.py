@@ -0,0 +1,70 @@
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+from config import OPENING_PREFETCH_WORKERS
+from interview_logic import InterviewAgent
+
+_prefetch_executor = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def _get_prefetch_executor():
+    """Return the process-wide opening prefetch pool"""
+    global _prefetch_executor
+    if _prefetch_executor is None:
+        with _prefetch_executor_lock:
+            if _prefetch_executor is None:
+                _prefetch_executor = ThreadPoolExecutor(max_workers=OPENING_PREFETCH_WORKERS, thread_name_prefix="prefetch")
+    return _prefetch_executor
+
+
+def prefetch_key(role, duration_minutes, candidate_info, resume_text, voice_mode=False):
+    """Everything the opening question and its audio depend on - a changed key means the prefetch is stale"""
+    payload = json.dumps([role, duration_minutes, candidate_info or {}, resume_text or "", bool(voice_mode)],
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class OpeningPrefetch:
+    """
+    Builds the InterviewAgent (and so its opening question) in the background,
+    optionally synthesizing the opening audio too, so starting the interview does not wait on either.
+    """
+
+    def __init__(self, role, duration_minutes, candidate_info=None, resume_text=None, synthesize=None):
+        self.key = prefetch_key(role, duration_minutes, candidate_info, resume_text, voice_mode=synthesize is not None)
+        self._cancelled = threading.Event()
+        self._future = _get_prefetch_executor().submit(
+            self._prepare, role, duration_minutes, candidate_info, resume_text, synthesize
+        )
+
+    def _prepare(self, role, duration_minutes, candidate_info, resume_text, synthesize):
+        # Same as InterviewAgent(...), split so a superseded prefetch stops before each expensive step
+        agent = InterviewAgent.__new__(InterviewAgent)
+        agent._init_state(role, duration_minutes, candidate_info, resume_text)
+        self._check_cancelled()
+        agent._initialize_chat()
+        if not synthesize:
+            return agent, None
+        self._check_cancelled()
+        return agent, synthesize(agent.get_first_question())
+
+    def _check_cancelled(self):
+        if self._cancelled.is_set():
+            raise CancelledError()
+
+    def matches(self, role, duration_minutes, candidate_info=None, resume_text=None, voice_mode=False):
+        return self.key == prefetch_key(role, duration_minutes, candidate_info, resume_text, voice_mode)
+
+    def done(self):
+        return self._future.done()
+
+    def result(self, timeout=None):
+        """Return (agent, opening audio path or None) - waits if still generating"""
+        return self._future.result(timeout)
+
+    def cancel(self):
+        """Drop a stale prefetch - one already running stops before its next model call or speech synthesis"""
+        self._cancelled.set()
+        self._future.cancel()
@@ -1,24 +1,338 @@
 import PyPDF2
 import docx
 import re
-import google.generativeai as genai
-from config import GEMINI_API_KEY, GEMINI_MODEL
+import io
+import os
+import json
+import hashlib
+import threading
+import time
+import multiprocessing
+from collections import OrderedDict
+from config import (RESUME_CACHE_DIR, RESUME_CACHE_MEMORY_ENTRIES, RESUME_CACHE_TTL_SECONDS, RESUME_CACHE_MAX_FILES,
+                    RESUME_TEXT_CHAR_BUDGET, PDF_EXTRACTION_WORKERS, PDF_PAGE_BATCH_SIZE, PDF_EXTRACTION_TIMEOUT)
+from llm_gateway import get_gateway
+from token_usage import UsageTag
+
+# Resume analysis runs before an interview session exists, so it is only counted globally
+RESUME_ANALYSIS_USAGE = UsageTag(None, "setup", "resume.analyze")
+
+# Bump when extraction prompts or output format change so stale cache entries are ignored
+RESUME_CACHE_VERSION = 2
+
+# Single schema-constrained call that validates and extracts at once
+RESUME_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "is_resume": {"type": "boolean"},
+        "rejection_reason": {"type": "string"},
+        "name": {"type": "string"},
+        "email": {"type": "string"},
+        "phone": {"type": "string"},
+        "skills": {"type": "array", "items": {"type": "string"}},
+        "years_of_experience": {"type": "string"},
+        "recent_job_title": {"type": "string"},
+        "recent_company": {"type": "string"},
+        "education": {"type": "string"},
+        "university": {"type": "string"},
+        "certifications": {"type": "array", "items": {"type": "string"}},
+        "key_projects": {"type": "array", "items": {"type": "string"}},
+        "key_achievements": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["is_resume", "name", "skills", "years_of_experience", "recent_job_title"],
+}
+
+RESUME_ANALYSIS_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": RESUME_ANALYSIS_SCHEMA,
+}
+
+# Local pre-validation signals
+RESUME_HEADINGS = re.compile(
+    r'^\s*(?:professional\s+)?(?:work\s+)?(?:experience|employment(?:\s+history)?|work\s+history|education|'
+    r'skills|technical\s+skills|projects|certifications?|summary|profile|objective|achievements|internships?)\s*:?\s*$',
+    re.IGNORECASE | re.MULTILINE
+)
+DATE_RANGE = re.compile(
+    r'\b(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+)?(?:19|20)\d{2}\s*'
+    r'(?:-|–|—|to)\s*(?:(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+)?(?:19|20)\d{2}|present|current|now)\b',
+    re.IGNORECASE
+)
+CONTACT_DETAILS = re.compile(
+    r'[\w.+-]+@[\w-]+\.[\w.-]+|linkedin\.com/|github\.com/|\+?\d[\d\s().-]{8,}\d'
+)
+
+
+def looks_like_resume(text):
+    """Cheap local check - False only for text that is clearly not a resume"""
+    if not text or text.startswith("Error reading"):
+        return False
+    sample = text[:8000]
+    signals = sum([
+        bool(RESUME_HEADINGS.search(sample)),
+        bool(DATE_RANGE.search(sample)),
+        bool(CONTACT_DETAILS.search(sample)),
+    ])
+    if signals == 0:
+        return False
+    # Very short text needs more than one signal to be worth an LLM call
+    if len(sample.strip()) < 200 and signals < 2:
+        return False
+    return True
+
+
+def default_candidate_info():
+    """Candidate info used when extraction fails or a field is missing"""
+    return {
+        "name": "Candidate",
+        "email": "Not Found",
+        "phone": "Not Found",
+        "skills": [],
+        "years_of_experience": "Not Found",
+        "recent_job_title": "Not Found",
+        "recent_company": "Not Found",
+        "education": "Not Found",
+        "university": "Not Found",
+        "certifications": [],
+        "key_projects": [],
+        "key_achievements": [],
+        "is_valid_resume": True
+    }
+
+
+def invalid_resume_info(reason=None):
+    """Candidate info returned for files that are not resumes - reason, when known, is shown to the user"""
+    detail = f" ({reason.strip().rstrip('.')})" if reason and reason.strip() else ""
+    return {
+        "name": "Invalid Resume",
+        "email": "Not a resume",
+        "phone": "Not a resume",
+        "skills": [],
+        "years_of_experience": "Not a resume",
+        "recent_job_title": "Not a resume",
+        "recent_company": "Not a resume",
+        "education": "Not a resume",
+        "university": "Not a resume",
+        "certifications": [],
+        "key_projects": [],
+        "key_achievements": [],
+        "is_valid_resume": False,
+        "validation_message": f"This file does not appear to be a resume{detail}. Please upload a valid resume/CV."
+    }
+
+
+def _extract_pdf_pages(pdf_bytes, start, stop, char_budget):
+    """Worker task: extract pages [start, stop) until char_budget is reached - returns (page_count, page_texts)"""
+    reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    page_count = len(reader.pages)
+    page_texts = []
+    collected = 0
+    for index in range(start, min(stop, page_count)):
+        page_text = reader.pages[index].extract_text() or ""
+        page_texts.append(page_text)
+        collected += len(page_text)
+        if collected >= char_budget:
+            break
+    return page_count, page_texts
+
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool(deadline):
+    """Return the process-wide PDF worker pool for an extraction that ends by deadline (time.monotonic())"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # spawn: forking a multi-threaded Streamlit server is unsafe
+            _pdf_pool = multiprocessing.get_context("spawn").Pool(PDF_EXTRACTION_WORKERS)
+            _pdf_pool.last_deadline = deadline  # When the last extraction using it gives up
+        _pdf_pool.last_deadline = max(_pdf_pool.last_deadline, deadline)
+        return _pdf_pool
+
+
+def _retire_pdf_pool(pool):
+    """Stop handing out a pool with a worker stuck on a document - later uploads get fresh workers.
+    Extractions already running on it keep it until the last of their deadlines has passed;
+    only then is it terminated, stuck worker included."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not pool:
+            return  # Already retired by another timed-out extraction
+        _pdf_pool = None
+    reaper = threading.Timer(max(0.0, pool.last_deadline - time.monotonic()), pool.terminate)
+    reaper.daemon = True
+    reaper.start()
+
+
+def extract_pdf_text(pdf_bytes, char_budget=RESUME_TEXT_CHAR_BUDGET, timeout=PDF_EXTRACTION_TIMEOUT):
+    """
+    Extract up to char_budget characters from a PDF using page batches in a process pool.
+    Returns whatever was extracted when the time limit is hit; raises if nothing was.
+    """
+    deadline = time.monotonic() + timeout
+    pool = _get_pdf_pool(deadline)
+    page_texts = []
+    collected = 0
+    try:
+        # The first batch also tells us how many pages there are
+        page_count, texts = pool.apply_async(
+            _extract_pdf_pages, (pdf_bytes, 0, PDF_PAGE_BATCH_SIZE, char_budget)
+        ).get(max(0.01, deadline - time.monotonic()))
+        page_texts.extend(texts)
+        collected = sum(len(text) for text in texts)
+        next_page = PDF_PAGE_BATCH_SIZE
+
+        while collected < char_budget and next_page < page_count:
+            # Extract one batch per worker in parallel, then consume them in page order
+            wave = []
+            for _ in range(PDF_EXTRACTION_WORKERS):
+                if next_page >= page_count:
+                    break
+                wave.append(pool.apply_async(
+                    _extract_pdf_pages, (pdf_bytes, next_page, next_page + PDF_PAGE_BATCH_SIZE, char_budget - collected)
+                ))
+                next_page += PDF_PAGE_BATCH_SIZE
+            for result in wave:
+                _, texts = result.get(max(0.01, deadline - time.monotonic()))
+                page_texts.extend(texts)
+                collected += sum(len(text) for text in texts)
+                if collected >= char_budget:
+                    break
+    except multiprocessing.TimeoutError:
+        _retire_pdf_pool(pool)
+        if not page_texts:
+            raise TimeoutError(f"PDF extraction exceeded {timeout} seconds")
+        print(f"PDF extraction timed out after {len(page_texts)} pages - using partial text")
+
+    return "\n".join(page_texts)[:char_budget]
+
+
+class ResumeCache:
+    """
+    Parsed resumes keyed by file content hash, kept in memory and on disk.
+    Entries hold personal data: files are readable by the owner only, in a directory
+    only the owner can list, and are deleted after ttl_seconds or beyond max_files.
+    """
+
+    def __init__(self, cache_dir=RESUME_CACHE_DIR, max_memory_entries=RESUME_CACHE_MEMORY_ENTRIES,
+                 ttl_seconds=RESUME_CACHE_TTL_SECONDS, max_files=RESUME_CACHE_MAX_FILES):
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max_memory_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_files = max_files
+        self._memory = OrderedDict()  # key -> (result, stored at), least recently used first
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        try:
+            os.chmod(cache_dir, 0o700)  # Tighten a directory created by an older version
+        except OSError as e:
+            print(f"Resume cache error: {e}")
+        self._purge()
+
+    @staticmethod
+    def make_key(file_bytes, file_type):
+        digest = hashlib.sha256(f"v{RESUME_CACHE_VERSION}:{file_type}:".encode("utf-8"))
+        digest.update(file_bytes)
+        return digest.hexdigest()
+
+    def _path_for(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Return (resume_text, candidate_info) or None"""
+        with self._lock:
+            if key in self._memory:
+                result, stored_at = self._memory[key]
+                if time.time() - stored_at < self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    return result
+                del self._memory[key]
+        path = self._path_for(key)
+        try:
+            stored_at = os.path.getmtime(path)
+            if time.time() - stored_at >= self.ttl_seconds:
+                os.unlink(path)
+                return None
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            result = (entry["resume_text"], entry["candidate_info"])
+        except (OSError, ValueError, KeyError):
+            return None
+        self._remember(key, result, stored_at)
+        return result
+
+    def put(self, key, resume_text, candidate_info):
+        self._remember(key, (resume_text, candidate_info), time.time())
+        tmp_path = f"{self._path_for(key)}.{threading.get_ident()}.tmp"
+        try:
+            # Owner-only from the moment it exists, whatever the umask
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(fd, "w", encoding="utf-8") as f:
+                json.dump({"resume_text": resume_text, "candidate_info": candidate_info}, f)
+            os.replace(tmp_path, self._path_for(key))
+        except OSError as e:
+            print(f"Resume cache error: {e}")
+        self._purge()
+
+    def _purge(self):
+        """Delete expired entries from disk, then the oldest ones beyond max_files"""
+        try:
+            names = [name for name in os.listdir(self.cache_dir) if name.endswith((".json", ".tmp"))]
+        except OSError:
+            return
+        now = time.time()
+        entries = []
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            try:
+                modified = os.path.getmtime(path)
+                if now - modified >= self.ttl_seconds:
+                    os.unlink(path)
+                elif name.endswith(".json"):
+                    entries.append((modified, path))
+            except OSError:
+                pass  # Removed by another process in the meantime
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_files)]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def _remember(self, key, result, stored_at):
+        with self._lock:
+            self._memory[key] = (result, stored_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+
+_resume_cache = None
+_resume_cache_lock = threading.Lock()
+
+
+def get_resume_cache():
+    """Return the process-wide resume cache"""
+    global _resume_cache
+    if _resume_cache is None:
+        with _resume_cache_lock:
+            if _resume_cache is None:
+                _resume_cache = ResumeCache()
+    return _resume_cache
 
-# Configure Gemini
-genai.configure(api_key=GEMINI_API_KEY)
 
 class ResumeParser:
     def __init__(self):
-        self.model = genai.GenerativeModel(GEMINI_MODEL)
+        self.llm = get_gateway()
+        self.cache = get_resume_cache()
     
     def extract_text_from_pdf(self, pdf_file):
-        """Extract text from PDF file"""
+        """Extract text from PDF file (bounded by RESUME_TEXT_CHAR_BUDGET and PDF_EXTRACTION_TIMEOUT)"""
         try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text
+            pdf_bytes = pdf_file.getvalue() if hasattr(pdf_file, "getvalue") else pdf_file.read()
+            return extract_pdf_text(pdf_bytes)
         except Exception as e:
             return f"Error reading PDF: {str(e)}"
     
@@ -26,10 +340,7 @@ class ResumeParser:
         """Extract text from DOCX file"""
         try:
             doc = docx.Document(docx_file)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
         except Exception as e:
             return f"Error reading DOCX: {str(e)}"
     
@@ -41,144 +352,88 @@ class ResumeParser:
             return f"Error reading TXT: {str(e)}"
     
     def parse_resume(self, file, file_type):
-        """Parse resume based on file type"""
-        if file_type == "pdf":
-            text = self.extract_text_from_pdf(file)
-        elif file_type == "docx":
-            text = self.extract_text_from_docx(file)
-        elif file_type == "txt":
-            text = self.extract_text_from_txt(file)
-        else:
+        """Parse resume based on file type, reusing cached results for identical files"""
+        if file_type not in ("pdf", "docx", "txt"):
             return None, None
         
+        file_bytes = file.getvalue() if hasattr(file, "getvalue") else file.read()
+        cache_key = self.cache.make_key(file_bytes, file_type)
+        cached = self.cache.get(cache_key)
+        if cached:
+            return cached
+        
+        text = self.extract_text(file_bytes, file_type)
+        
         # Extract structured information using AI
-        candidate_info = self.extract_candidate_info(text)
+        candidate_info, extracted = self._extract_candidate_info(text)
+        self.cache_result(cache_key, text, candidate_info, extracted)
         
         return text, candidate_info
     
+    def extract_text(self, file_bytes, file_type):
+        """Extract raw text from file contents based on file type"""
+        file = io.BytesIO(file_bytes)
+        if file_type == "pdf":
+            return self.extract_text_from_pdf(file)
+        if file_type == "docx":
+            return self.extract_text_from_docx(file)
+        return self.extract_text_from_txt(file)
+    
+    def cache_result(self, cache_key, text, candidate_info, extracted):
+        """Cache a parse result unless it came from a read error or failed LLM call"""
+        # A retry may succeed, so fallbacks are never cached
+        if extracted and not text.startswith("Error reading"):
+            self.cache.put(cache_key, text, candidate_info)
+    
     def extract_candidate_info(self, resume_text):
         """Extract comprehensive candidate information using AI and validate it's a resume"""
+        candidate_info, _ = self._extract_candidate_info(resume_text)
+        return candidate_info
+    
+    def _extract_candidate_info(self, resume_text):
+        """Same as extract_candidate_info, but also returns whether the AI call succeeded"""
         
-        # First, validate if this is actually a resume
-        validation_prompt = f"""Analyze this text and determine if it's a resume/CV:
-
-Text to analyze:
-{resume_text[:1000]}
-
-Is this a resume or CV? Answer with ONLY "YES" or "NO" followed by a brief reason.
-
-A resume typically contains:
-- Personal information (name, contact)
-- Work experience or job history
-- Education
-- Skills
-- Professional summary
-
-Answer format: YES/NO - reason"""
-
-        try:
-            validation_response = self.model.generate_content(validation_prompt)
-            validation_text = validation_response.text.strip().upper()
-            
-            # Check if it's not a resume
-            if validation_text.startswith("NO"):
-                return {
-                    "name": "Invalid Resume",
-                    "email": "Not a resume",
-                    "phone": "Not a resume",
-                    "skills": [],
-                    "years_of_experience": "Not a resume",
-                    "recent_job_title": "Not a resume",
-                    "recent_company": "Not a resume",
-                    "education": "Not a resume",
-                    "university": "Not a resume",
-                    "certifications": [],
-                    "key_projects": [],
-                    "key_achievements": [],
-                    "is_valid_resume": False,
-                    "validation_message": "This file does not appear to be a resume. Please upload a valid resume/CV."
-                }
-        except Exception as e:
-            print(f"Resume validation error: {e}")
-            # Continue with extraction if validation fails
+        # Reject obvious non-resumes locally, without an LLM round trip
+        if not looks_like_resume(resume_text):
+            return invalid_resume_info(), True
         
-        prompt = f"""Analyze this resume carefully and extract detailed information in JSON format:
+        prompt = f"""Analyze this text. First decide whether it is a resume/CV, then extract detailed candidate information.
 
-Resume Text:
+Text to analyze:
 {resume_text[:4000]}
 
-Extract the following information accurately:
+A resume typically contains personal information (name, contact), work experience or job history,
+education, skills and a professional summary. Set "is_resume" to false if the text is not a resume/CV
+and give a brief "rejection_reason"; the remaining fields may then be empty.
+
+If it is a resume, extract the following information accurately:
 1. Full Name (first and last name)
 2. Email address
 3. Phone number
 4. Top 8-10 Technical Skills (be comprehensive)
-5. Total Years of Experience (calculate from work history)
+5. Total Years of Experience (calculate from work history, e.g. "X years")
 6. Most Recent Job Title
 7. Most Recent Company
 8. Highest Education Degree
 9. University Name
-10. Key Projects (top 3-4 with brief descriptions)
+10. Key Projects (top 3-4, each "Project: brief description")
 11. Key Achievements (quantifiable results, metrics)
 12. Certifications (if any)
 
-Be thorough and extract as much relevant information as possible.
-
-Return ONLY valid JSON:
-{{
-    "name": "Full Name",
-    "email": "email@example.com",
-    "phone": "+1234567890",
-    "skills": ["skill1", "skill2", "skill3", "skill4", "skill5", "skill6", "skill7", "skill8"],
-    "years_of_experience": "X years",
-    "recent_job_title": "Job Title",
-    "recent_company": "Company Name",
-    "education": "Degree Name",
-    "university": "University Name",
-    "certifications": ["cert1", "cert2"],
-    "key_projects": [
-        "Project 1: Brief description",
-        "Project 2: Brief description",
-        "Project 3: Brief description"
-    ],
-    "key_achievements": [
-        "Achievement 1 with metrics",
-        "Achievement 2 with metrics",
-        "Achievement 3 with metrics"
-    ],
-    "is_valid_resume": true
-}}
-
-Return ONLY the JSON object."""
+Be thorough and extract as much relevant information as possible. Use "Not Found" for missing text fields."""
 
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
+            response_text = self.llm.generate(prompt, generation_config=RESUME_ANALYSIS_CONFIG, usage=RESUME_ANALYSIS_USAGE)
+            analysis = json.loads(response_text)
             
-            # Clean response
-            if response_text.startswith("```json"):
-                response_text = response_text.replace("```json", "").replace("```", "").strip()
-            elif response_text.startswith("```"):
-                response_text = response_text.replace("```", "").strip()
+            if not analysis.pop("is_resume", True):
+                return invalid_resume_info(analysis.get("rejection_reason")), True
             
-            import json
-            candidate_info = json.loads(response_text)
+            analysis.pop("rejection_reason", None)
+            candidate_info = {**default_candidate_info(), **analysis}
             candidate_info["is_valid_resume"] = True
-            return candidate_info
+            return candidate_info, True
         except Exception as e:
             print(f"Resume parsing error: {e}")
             # Return default structure
-            return {
-                "name": "Candidate",
-                "email": "Not Found",
-                "phone": "Not Found",
-                "skills": [],
-                "years_of_experience": "Not Found",
-                "recent_job_title": "Not Found",
-                "recent_company": "Not Found",
-                "education": "Not Found",
-                "university": "Not Found",
-                "certifications": [],
-                "key_projects": [],
-                "key_achievements": [],
-                "is_valid_resume": True
-            }
\ No newline at end of file
+            return default_candidate_info(), False
@@ -0,0 +1,122 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from config import SESSION_DB_PATH, SESSION_RETENTION_DAYS
+
+
+class SessionConflict(Exception):
+    """The session was saved by someone else since it was loaded"""
+
+
+def new_session_id():
+    return uuid.uuid4().hex
+
+
+class SessionStore:
+    """
+    Interview sessions saved as JSON rows in SQLite.
+    Write-ahead logging keeps per-turn saves cheap and lets readers in other
+    threads and processes see committed sessions while a write is in progress.
+    Rows hold resumes and contact details: the database and its WAL files are
+    readable by the owner only, in a directory only the owner can list when the store creates it.
+    """
+
+    def __init__(self, path=SESSION_DB_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        # Owner-only from the moment it exists, whatever the umask - SQLite gives -wal and -shm the same mode
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._restrict_permissions()
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # Durable at each checkpoint, no fsync per turn
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id TEXT PRIMARY KEY, state TEXT NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+            "version INTEGER NOT NULL DEFAULT 1)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sessions)")}
+        if "version" not in columns:
+            self._conn.execute("ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+
+    def _restrict_permissions(self):
+        """Tighten a database (and WAL files) created by an older version"""
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.chmod(self.path + suffix, 0o600)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Session store error: {e}")
+
+    def save(self, session_id, state, expected_version=None):
+        """Insert or replace a session's state (any JSON-serializable dict) - returns its new version.
+        With expected_version, raises SessionConflict unless the stored version still matches."""
+        now = time.time()
+        payload = json.dumps(state)
+        with self._lock:
+            if expected_version is None:
+                self._conn.execute(
+                    "INSERT INTO sessions (id, state, created_at, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at, "
+                    "version = sessions.version + 1",
+                    (session_id, payload, now, now)
+                )
+            else:
+                cursor = self._conn.execute(
+                    "UPDATE sessions SET state = ?, updated_at = ?, version = version + 1 WHERE id = ? AND version = ?",
+                    (payload, now, session_id, expected_version)
+                )
+                if cursor.rowcount != 1:
+                    raise SessionConflict(f"Session {session_id} changed since version {expected_version}")
+            return self._conn.execute("SELECT version FROM sessions WHERE id = ?", (session_id,)).fetchone()[0]
+
+    def load(self, session_id):
+        """Return the saved state dict, or None for an unknown session"""
+        state, version = self.load_versioned(session_id)
+        return state
+
+    def load_versioned(self, session_id):
+        """Return (state, version), or (None, None) for an unknown session"""
+        with self._lock:
+            row = self._conn.execute("SELECT state, version FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else (None, None)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def purge(self, older_than_seconds=SESSION_RETENTION_DAYS * 86400):
+        """Delete sessions not updated for older_than_seconds - returns how many were removed"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - older_than_seconds,))
+        return cursor.rowcount
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_session_store = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """Return the process-wide session store, purging expired sessions on first use"""
+    global _session_store
+    if _session_store is None:
+        with _session_store_lock:
+            if _session_store is None:
+                store = SessionStore()
+                store.purge()
+                _session_store = store
+    return _session_store
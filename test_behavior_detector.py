@@ -0,0 +1,33 @@
+"""
+Checks for behavior detection: word limits count whitespace-separated words,
+and phrases match inside quotes.
+
+    python -m unittest test_behavior_detector
+"""
+import unittest
+
+from behavior_detector import detect_behavior
+
+
+class DetectBehaviorTest(unittest.TestCase):
+    def test_word_count_ignores_hyphens_and_punctuation(self):
+        signals = detect_behavior("end-to-end testing is my thing and I think")
+        self.assertEqual(signals.word_count, 8)  # 10 tokens, but 8 words
+        self.assertTrue(signals.confused)  # A short answer with a vague word
+
+    def test_phrases_match_inside_quotes(self):
+        for answer in ("I'd say 'maybe'", "I'd say \"maybe\"", "I’d say ‘maybe’", "I’d say “maybe”"):
+            with self.subTest(answer=answer):
+                self.assertIn("maybe", detect_behavior(answer).matches["confusion"])
+
+    def test_contractions_still_match(self):
+        self.assertTrue(detect_behavior("Honestly I'm done, thanks").wants_exit)
+        self.assertTrue(detect_behavior("I don’t understand the question").confused)
+
+    def test_long_answer_is_chatty(self):
+        self.assertTrue(detect_behavior("word " * 201).off_topic)
+        self.assertFalse(detect_behavior("word " * 200).off_topic)
+
+
+if __name__ == "__main__":
+    unittest.main()
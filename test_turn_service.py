@@ -0,0 +1,111 @@
+"""
+Checks for the stateless turn service: sessions survive a to_dict/from_dict round trip,
+feedback tokens are billed to their session, and two turns saved over the same stored
+version don't both win.
+
+    python -m unittest test_turn_service
+"""
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+os.environ["LLM_BACKEND"] = "fake"  # Nothing here should reach a real model
+
+from interview_logic import InterviewAgent
+from llm_gateway import FakeBackend, set_backend
+from session_store import SessionStore, SessionConflict
+from turn_client import TurnClient, TurnServiceError
+from turn_service import TurnService, create_server
+
+ANSWERS = [
+    "I led the migration of our billing service to Postgres and cut query latency in half.",
+    "Um, I'm not sure what you mean by that, could you clarify?",
+    "By the way, that reminds me of a side project where I built a small compiler.",
+]
+
+
+class TurnServiceTest(unittest.TestCase):
+    def setUp(self):
+        set_backend(FakeBackend())
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = SessionStore(os.path.join(self.temp_dir.name, "sessions.db"))
+        self.service = TurnService(self.store)
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def start(self):
+        return self.service.start_session("Software Engineer", 15, {"name": "Sam"})["session_id"]
+
+    def test_round_trip(self):
+        session_id = self.start()
+        for answer in ANSWERS:
+            self.service.take_turn(session_id, answer)
+        data = self.store.load(session_id)["agent"]
+
+        agent = InterviewAgent.from_dict(data)
+        self.assertEqual(agent.to_dict(), data)
+        self.assertEqual(len(agent.conversation_history), 1 + 2 * len(ANSWERS))
+        self.assertEqual(agent.token_usage.total_tokens, data["token_usage"]["total"]["prompt_tokens"]
+                         + data["token_usage"]["total"]["output_tokens"])
+        self.assertGreater(agent.confusion_indicators, 0)
+        self.assertFalse(agent.is_interview_complete())
+
+    def test_loaded_agent_skips_closing_prefetch(self):
+        session_id = self.start()
+        agent, state, version = self.service._load(session_id)
+        agent.prepare_closings()
+        self.assertEqual(agent.prepared_closings, {})
+
+    def test_feedback_tokens_are_billed_to_the_session(self):
+        session_id = self.start()
+        self.service.take_turn(session_id, ANSWERS[0])
+        self.service.end_session(session_id)
+        agent, state, version = self.service._load(session_id)
+        json.dumps(agent.get_conversation_history())  # Metadata stays plain data
+
+        self.service.get_feedback(session_id)
+        usage = self.service.get_session(session_id)["token_usage"]
+        self.assertIn("feedback", usage["by_phase"])
+
+    def test_stale_save_conflicts(self):
+        session_id = self.start()
+        state, version = self.store.load_versioned(session_id)
+        self.store.save(session_id, state, expected_version=version)
+        with self.assertRaises(SessionConflict):
+            self.store.save(session_id, state, expected_version=version)
+
+    def test_concurrent_turns_get_409(self):
+        # Both turns load the same version while the slow model answers; only one save can win
+        set_backend(FakeBackend(latency=0.3))
+        server = create_server("127.0.0.1", 0, self.service)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            client = TurnClient(f"http://127.0.0.1:{server.server_address[1]}")
+            session_id = client.start("Software Engineer", 15, {"name": "Sam"})["session_id"]
+            statuses = []
+
+            def turn(answer):
+                try:
+                    client.turn(session_id, answer)
+                    statuses.append(200)
+                except TurnServiceError as e:
+                    statuses.append(e.status)
+
+            threads = [threading.Thread(target=turn, args=(answer,)) for answer in ANSWERS[:2]]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(sorted(statuses), [200, 409])
+            self.assertEqual(len(client.session(session_id)["messages"]), 3)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
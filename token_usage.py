@@ -0,0 +1,141 @@
+import threading
+from collections import namedtuple, OrderedDict
+from config import (GEMINI_INPUT_PRICE_PER_MTOK, GEMINI_OUTPUT_PRICE_PER_MTOK, SESSION_TOKEN_BUDGET,
+                    SESSION_BUDGET_TIGHT_FRACTION, USAGE_LEDGER_MAX_SESSIONS)
+
+# Who a model call is billed to: the interview session (None before one exists), the phase
+# ("setup", "opening", "turn", "closing", "feedback") and the call site that made it
+UsageTag = namedtuple("UsageTag", ["session_id", "phase", "call_site", "totals"])
+UsageTag.__new__.__defaults__ = (None,)  # totals: optional UsageTotals that also receives the usage
+
+BUDGET_OK = "ok"
+BUDGET_TIGHT = "tight"  # Near the budget - send shorter prompts
+BUDGET_EXHAUSTED = "exhausted"  # Over the budget - use local fallbacks instead of the model
+
+
+def cost_usd(prompt_tokens, output_tokens):
+    return (prompt_tokens * GEMINI_INPUT_PRICE_PER_MTOK + output_tokens * GEMINI_OUTPUT_PRICE_PER_MTOK) / 1_000_000
+
+
+def _empty_counts():
+    return {"calls": 0, "prompt_tokens": 0, "output_tokens": 0}
+
+
+def _summarize(counts):
+    return {
+        **counts,
+        "total_tokens": counts["prompt_tokens"] + counts["output_tokens"],
+        "cost_usd": round(cost_usd(counts["prompt_tokens"], counts["output_tokens"]), 6),
+    }
+
+
+class UsageTotals:
+    """Token counts for one scope (a session, or the whole process), broken down by phase and call site"""
+
+    def __init__(self):
+        self.total = _empty_counts()
+        self.by_phase = {}
+        self.by_call_site = {}
+        self._lock = threading.Lock()
+
+    def add(self, phase, call_site, prompt_tokens, output_tokens):
+        with self._lock:
+            for counts in (self.total, self.by_phase.setdefault(phase, _empty_counts()),
+                           self.by_call_site.setdefault(call_site, _empty_counts())):
+                counts["calls"] += 1
+                counts["prompt_tokens"] += prompt_tokens
+                counts["output_tokens"] += output_tokens
+
+    @property
+    def total_tokens(self):
+        return self.total["prompt_tokens"] + self.total["output_tokens"]
+
+    def budget_state(self, budget=SESSION_TOKEN_BUDGET):
+        """BUDGET_OK, BUDGET_TIGHT or BUDGET_EXHAUSTED for a token budget (0 = unlimited)"""
+        if not budget:
+            return BUDGET_OK
+        if self.total_tokens >= budget:
+            return BUDGET_EXHAUSTED
+        if self.total_tokens >= budget * SESSION_BUDGET_TIGHT_FRACTION:
+            return BUDGET_TIGHT
+        return BUDGET_OK
+
+    def summary(self):
+        """Totals with cost, plus the per-phase and per-call-site breakdown"""
+        with self._lock:
+            return {
+                **_summarize(self.total),
+                "by_phase": {phase: _summarize(counts) for phase, counts in self.by_phase.items()},
+                "by_call_site": {site: _summarize(counts) for site, counts in self.by_call_site.items()},
+            }
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "total": dict(self.total),
+                "by_phase": {phase: dict(counts) for phase, counts in self.by_phase.items()},
+                "by_call_site": {site: dict(counts) for site, counts in self.by_call_site.items()},
+            }
+
+    @classmethod
+    def from_dict(cls, data):
+        totals = cls()
+        if data:
+            totals.total = dict(data["total"])
+            totals.by_phase = {phase: dict(counts) for phase, counts in data["by_phase"].items()}
+            totals.by_call_site = {site: dict(counts) for site, counts in data["by_call_site"].items()}
+        return totals
+
+
+class UsageLedger:
+    """Process-wide token accounting - global totals plus the most recently active sessions"""
+
+    def __init__(self, max_sessions=USAGE_LEDGER_MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self.totals = UsageTotals()
+        self._sessions = OrderedDict()  # session_id -> UsageTotals, least recently used first
+        self._lock = threading.Lock()
+
+    def record(self, tag, prompt_tokens, output_tokens):
+        tag = tag or UsageTag(None, "other", "unknown")
+        self.totals.add(tag.phase, tag.call_site, prompt_tokens, output_tokens)
+        if tag.totals is not None:
+            tag.totals.add(tag.phase, tag.call_site, prompt_tokens, output_tokens)
+        if tag.session_id is None:
+            return
+        with self._lock:
+            session = self._sessions.pop(tag.session_id, None) or UsageTotals()
+            self._sessions[tag.session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        session.add(tag.phase, tag.call_site, prompt_tokens, output_tokens)
+
+    def session(self, session_id):
+        """Summary of one session's usage in this process, or None if it made no calls here"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+        return session.summary() if session else None
+
+    def summary(self):
+        with self._lock:
+            sessions = len(self._sessions)
+        return {**self.totals.summary(), "sessions": sessions}
+
+    def reset(self):
+        with self._lock:
+            self._sessions.clear()
+        self.totals = UsageTotals()
+
+
+_usage_ledger = None
+_usage_ledger_lock = threading.Lock()
+
+
+def get_usage_ledger():
+    """Return the process-wide usage ledger"""
+    global _usage_ledger
+    if _usage_ledger is None:
+        with _usage_ledger_lock:
+            if _usage_ledger is None:
+                _usage_ledger = UsageLedger()
+    return _usage_ledger
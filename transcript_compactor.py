@@ -0,0 +1,133 @@
+import re
+from collections import namedtuple
+from config import FEEDBACK_TRANSCRIPT_TOKEN_BUDGET, FEEDBACK_ANSWER_VERBATIM_WORDS
+from conversation_memory import estimate_tokens
+from answer_metrics import STOP_WORDS, QUANTIFIED_RESULT
+
+MIN_ANSWER_WORDS = 15  # Long answers are never cut below this many words
+GAP = " [...]"
+
+CompactTranscript = namedtuple("CompactTranscript", ["text", "original_tokens", "compact_tokens", "compression_ratio"])
+
+_SENTENCES = re.compile(r'(?<=[.!?])\s+')
+_WORD = re.compile(r"[a-z0-9']+")
+_NORMALIZE = re.compile(r'[^a-z0-9]+')
+
+
+def format_verbatim(messages):
+    """The full transcript, every message word for word"""
+    transcript = []
+    for msg in messages:
+        role = "🎤 Interviewer" if msg["role"] == "assistant" else "👤 Candidate"
+        transcript.append(f"{role}: {msg['content']}")
+    return "\n\n".join(transcript)
+
+
+def _content_words(text):
+    return {word for word in _WORD.findall(text.lower()) if word not in STOP_WORDS and len(word) > 2}
+
+
+def _sentence_score(sentence, question_words):
+    """How much a sentence says: distinct content words, numbers/results, and ties to the question"""
+    words = _content_words(sentence)
+    return len(words) + 3 * len(QUANTIFIED_RESULT.findall(sentence)) + 2 * len(words & question_words)
+
+
+def _compact_answer(answer, question, max_words):
+    """Keep the most informative sentences of a long answer, in their original order"""
+    words = answer.split()
+    if len(words) <= max_words:
+        return " ".join(words)
+
+    sentences = [sentence for sentence in _SENTENCES.split(answer.strip()) if sentence]
+    question_words = _content_words(question)
+    ranked = sorted(range(len(sentences)), key=lambda i: _sentence_score(sentences[i], question_words), reverse=True)
+
+    kept, used, said = set(), 0, set()
+    for i in ranked:
+        length = len(sentences[i].split())
+        key = _NORMALIZE.sub(" ", sentences[i].lower()).strip()
+        if key not in said and used + length <= max_words:
+            kept.add(i)
+            said.add(key)
+            used += length
+    if not kept:
+        # A single run-on sentence - keep its opening words
+        return " ".join(words[:max_words]) + GAP
+
+    parts = []
+    for i in range(len(sentences)):
+        if i in kept:
+            parts.append(" ".join(sentences[i].split()))
+        elif not parts or parts[-1] != GAP.strip():
+            parts.append(GAP.strip())
+    return " ".join(parts)
+
+
+def _compact_questions(messages, max_words):
+    """Drop interviewer sentences already said earlier (acknowledgements, boilerplate) and trim long turns to their questions"""
+    seen = set()
+    compacted = []
+    for msg in messages:
+        if msg["role"] != "assistant":
+            compacted.append(None)
+            continue
+        sentences = [sentence for sentence in _SENTENCES.split(msg["content"].strip()) if sentence]
+        kept = []
+        for sentence in sentences:
+            key = _NORMALIZE.sub(" ", sentence.lower()).strip()
+            if key not in seen:
+                kept.append(sentence)
+            seen.add(key)
+        if len(" ".join(kept).split()) > max_words:
+            kept = [sentence for sentence in kept if sentence.endswith("?")] or kept[-1:]
+        compacted.append((" ".join(kept) or sentences[-1]) if sentences else "")
+    return compacted
+
+
+def _render(messages, questions, answer_words, skip_exchanges=0):
+    lines = []
+    question = ""
+    answers_seen = 0
+    if skip_exchanges:
+        lines.append(f"[{skip_exchanges} earlier exchanges omitted]")
+    for msg, compact_question in zip(messages, questions):
+        if msg["role"] == "assistant":
+            question = msg["content"]
+            if answers_seen >= skip_exchanges and compact_question:
+                lines.append(f"Interviewer: {compact_question}")
+        elif msg["content"].strip():
+            answers_seen += 1
+            if answers_seen > skip_exchanges:
+                lines.append(f"Candidate: {_compact_answer(msg['content'], question, answer_words)}")
+    return "\n".join(lines)
+
+
+def compact_transcript(messages, token_budget=FEEDBACK_TRANSCRIPT_TOKEN_BUDGET, verbatim_words=FEEDBACK_ANSWER_VERBATIM_WORDS):
+    """
+    Transcript for the feedback prompt within token_budget - returns CompactTranscript.
+    Long answers are cut to their most informative sentences, halving the per-answer
+    allowance until the transcript fits; the oldest exchanges go last.
+    """
+    original_tokens = estimate_tokens(format_verbatim(messages))
+    questions = _compact_questions(messages, verbatim_words)
+
+    answer_words = verbatim_words
+    text = _render(messages, questions, answer_words)
+    while estimate_tokens(text) > token_budget and answer_words > MIN_ANSWER_WORDS:
+        answer_words = max(MIN_ANSWER_WORDS, answer_words // 2)
+        text = _render(messages, questions, answer_words)
+
+    answers = sum(1 for msg in messages if msg["role"] != "assistant" and msg["content"].strip())
+    skip = 0
+    while estimate_tokens(text) > token_budget and skip < answers - 1:
+        skip += 1
+        text = _render(messages, questions, answer_words, skip_exchanges=skip)
+
+    compact_tokens = estimate_tokens(text)
+    return CompactTranscript(
+        text=text,
+        original_tokens=original_tokens,
+        compact_tokens=compact_tokens,
+        compression_ratio=round(compact_tokens / original_tokens, 3) if original_tokens else 1.0
+    )
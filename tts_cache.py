@@ -0,0 +1,119 @@
+import hashlib
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from config import TTS_CACHE_MAX_BYTES
+
+
+class TTSCache:
+    """Content-addressed on-disk cache of synthesized audio with size-bounded LRU eviction"""
+
+    def __init__(self, cache_dir, max_bytes=TTS_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> size in bytes, least recently used first
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuild the LRU order from files already on disk (oldest mtime first)"""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if name.startswith("tts_") and name.endswith(".mp3"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                files.append((stat.st_mtime, name[4:-4], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def make_key(*parts):
+        """Hash the given parts (e.g. cleaned text, language, speed) into a cache key"""
+        return hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, f"tts_{key}.mp3")
+
+    def get(self, key):
+        """Return the cached audio path, or None on a miss"""
+        path = self.path_for(key)
+        with self._lock:
+            if key in self._entries and os.path.exists(path):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                try:
+                    os.utime(path)  # Keep LRU order across restarts
+                except OSError:
+                    pass
+                return path
+            if key in self._entries:
+                # File was removed behind our back (e.g. cleanup_audio_files)
+                self._total_bytes -= self._entries.pop(key)
+            self.misses += 1
+            return None
+
+    def put(self, key, write_audio):
+        """Store audio produced by write_audio(path) under key - returns the cached path or None"""
+        path = self.path_for(key)
+        tmp_path = os.path.join(self.cache_dir, f"tmp_{uuid.uuid4().hex}.mp3")
+        try:
+            write_audio(tmp_path)
+            if not os.path.exists(tmp_path):
+                return None
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+        size = os.path.getsize(path)
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict(keep=key)
+        return path
+
+    def _evict(self, keep):
+        """Delete least recently used entries until the cache fits within max_bytes"""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            if key == keep:
+                break
+            self._total_bytes -= self._entries.pop(key)
+            try:
+                os.unlink(self.path_for(key))
+            except OSError:
+                pass
+
+    def stats(self):
+        """Return hit/miss counters and current cache size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_tts_cache(cache_dir):
+    """Return the process-wide cache for a directory so counters survive Streamlit reruns"""
+    with _caches_lock:
+        cache = _caches.get(cache_dir)
+        if cache is None:
+            cache = TTSCache(cache_dir)
+            _caches[cache_dir] = cache
+        return cache
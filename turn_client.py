@@ -0,0 +1,67 @@
+import base64
+import json
+import os
+import urllib.error
+import urllib.request
+from config import TURN_SERVICE_HOST, TURN_SERVICE_PORT
+
+
+class TurnServiceError(Exception):
+    def __init__(self, status, message):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class TurnClient:
+    """Client for turn_service.py - one method per endpoint, each returning the JSON response"""
+
+    def __init__(self, base_url=None, timeout=120):
+        self.base_url = (base_url or f"http://{TURN_SERVICE_HOST}:{TURN_SERVICE_PORT}").rstrip("/")
+        self.timeout = timeout
+
+    def health(self):
+        return self._request("GET", "/health")
+
+    def parse_resume(self, file_bytes, file_type):
+        return self._request("POST", "/resumes", {
+            "file_type": file_type,
+            "content_base64": base64.b64encode(file_bytes).decode("ascii"),
+        })
+
+    def parse_resume_file(self, path):
+        with open(path, "rb") as f:
+            return self.parse_resume(f.read(), os.path.splitext(path)[1].lstrip("."))
+
+    def start(self, role, duration_minutes, candidate_info=None, resume_text=None):
+        return self._request("POST", "/sessions", {
+            "role": role,
+            "duration_minutes": duration_minutes,
+            "candidate_info": candidate_info,
+            "resume_text": resume_text,
+        })
+
+    def session(self, session_id):
+        return self._request("GET", f"/sessions/{session_id}")
+
+    def turn(self, session_id, answer):
+        return self._request("POST", f"/sessions/{session_id}/turn", {"answer": answer})
+
+    def end(self, session_id):
+        return self._request("POST", f"/sessions/{session_id}/end")
+
+    def feedback(self, session_id):
+        return self._request("POST", f"/sessions/{session_id}/feedback")
+
+    def _request(self, method, path, payload=None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", e.reason)
+            except ValueError:
+                message = e.reason
+            raise TurnServiceError(e.code, message) from None
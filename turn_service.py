@@ -0,0 +1,303 @@
+"""
+Headless HTTP API for interviews.
+
+Every request loads the session from the shared session store and saves it back,
+so any worker process can serve any turn. Run several workers on one port:
+
+    python turn_service.py --workers 4 --port 8780
+
+Endpoints (JSON in, JSON out):
+    POST /resumes                   {"file_type": "pdf", "content_base64": "..."}
+    POST /sessions                  {"role", "duration_minutes", "candidate_info", "resume_text"}
+    GET  /sessions/<id>
+    POST /sessions/<id>/turn        {"answer": "..."}
+    POST /sessions/<id>/end
+    POST /sessions/<id>/feedback
+    GET  /health
+    GET  /metrics                   Prometheus text (per-stage latency histograms of this worker)
+    GET  /metrics.json
+    GET  /usage                     Token usage and cost of this worker, by phase and call site
+"""
+import argparse
+import base64
+import binascii
+import io
+import json
+import multiprocessing
+import re
+import signal
+import socket
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import (INTERVIEW_ROLES, INTERVIEW_DURATIONS, SUPPORTED_RESUME_FORMATS,
+                    TURN_SERVICE_HOST, TURN_SERVICE_PORT, TURN_SERVICE_WORKERS)
+from interview_logic import InterviewAgent
+from feedback_generator import FeedbackGenerator
+from resume_parser import ResumeParser
+from session_store import get_session_store, SessionConflict
+from latency_metrics import get_latency_recorder
+from token_usage import get_usage_ledger
+
+
+class SessionNotFound(LookupError):
+    pass
+
+
+class TurnService:
+    """Interview operations over stored sessions - each call is load, act, save"""
+
+    def __init__(self, store=None):
+        self.store = store or get_session_store()
+        self.resume_parser = ResumeParser()
+
+    def parse_resume(self, file_bytes, file_type):
+        file_type = file_type.lower().lstrip(".")
+        if f".{file_type}" not in SUPPORTED_RESUME_FORMATS:
+            raise ValueError(f"Unsupported resume format: {file_type}")
+        resume_text, candidate_info = self.resume_parser.parse_resume(io.BytesIO(file_bytes), file_type)
+        return {"resume_text": resume_text, "candidate_info": candidate_info}
+
+    def start_session(self, role, duration_minutes, candidate_info=None, resume_text=None):
+        if role not in INTERVIEW_ROLES:
+            raise ValueError(f"Unknown role: {role}")
+        if duration_minutes not in INTERVIEW_DURATIONS.values():
+            raise ValueError(f"Duration must be one of {sorted(INTERVIEW_DURATIONS.values())} minutes")
+
+        agent = InterviewAgent(role, duration_minutes=duration_minutes, candidate_info=candidate_info, resume_text=resume_text)
+        agent.start_interview()
+        session_id = agent.session_id
+        self.store.save(session_id, {"agent": agent.to_dict(), "feedback": None})
+        return {"session_id": session_id, "question": agent.get_first_question(), **self._status(agent)}
+
+    def get_session(self, session_id):
+        agent, state, version = self._load(session_id)
+        return {
+            "session_id": session_id,
+            "role": agent.role,
+            "messages": agent.conversation_history,
+            "feedback": state.get("feedback"),
+            "token_usage": agent.token_usage.summary(),
+            **self._status(agent),
+        }
+
+    def take_turn(self, session_id, answer):
+        agent, state, version = self._load(session_id)
+        if agent.is_interview_complete():
+            raise ValueError("Interview has already ended")
+        turn = sum(1 for msg in agent.conversation_history if msg["role"] == "user") + 1
+        with get_latency_recorder().span("llm_reply", session_id, turn):
+            reply = agent.get_next_question(answer)
+        self._save(session_id, agent, state, version)
+        return {"reply": reply, **self._status(agent)}
+
+    def end_session(self, session_id):
+        agent, state, version = self._load(session_id)
+        if agent.is_interview_complete():
+            closing = agent.conversation_history[-1]["content"] if agent.conversation_history else ""
+        else:
+            closing = agent.end_interview()
+            self._save(session_id, agent, state, version)
+        return {"closing": closing, **self._status(agent)}
+
+    def get_feedback(self, session_id):
+        """Generate feedback once per session - later calls return the stored report"""
+        agent, state, version = self._load(session_id)
+        if not agent.is_interview_complete():
+            raise ValueError("End the interview before requesting feedback")
+        if state.get("feedback") is None:
+            feedback_gen = FeedbackGenerator(agent.role, agent.get_conversation_history(), candidate_info=agent.candidate_info,
+                                             usage=agent.feedback_usage())
+            state["feedback"] = feedback_gen.generate_feedback()
+            # How much of the interview the feedback prompts saw, as compacted for them
+            state["transcript_stats"] = feedback_gen.transcript_stats
+            self._save(session_id, agent, state, version)
+        return {"feedback": state["feedback"], "transcript_stats": state.get("transcript_stats")}
+
+    def _load(self, session_id):
+        state, version = self.store.load_versioned(session_id)
+        if state is None:
+            raise SessionNotFound(f"Unknown session: {session_id}")
+        # The agent is saved at the end of this request, so closings prefetched now would never be kept
+        return InterviewAgent.from_dict(state["agent"], prefetch_closings=False), state, version
+
+    def _save(self, session_id, agent, state, version):
+        # Fails with SessionConflict if another worker saved this session in the meantime
+        state["agent"] = agent.to_dict()
+        self.store.save(session_id, state, expected_version=version)
+
+    @staticmethod
+    def _status(agent):
+        remaining = agent.get_time_remaining()
+        return {
+            "interview_ended": agent.is_interview_complete(),
+            "time_remaining": round(remaining, 1) if remaining is not None else None,
+            "tokens_used": agent.token_usage.total_tokens,
+            "token_budget": agent.budget_state(),
+        }
+
+
+class _TurnRequestHandler(BaseHTTPRequestHandler):
+    service = None
+
+    ROUTES = [
+        ("GET", re.compile(r'^/health$'), "_health"),
+        ("GET", re.compile(r'^/metrics$'), "_metrics"),
+        ("GET", re.compile(r'^/metrics\.json$'), "_metrics_json"),
+        ("GET", re.compile(r'^/usage$'), "_usage"),
+        ("POST", re.compile(r'^/resumes$'), "_parse_resume"),
+        ("POST", re.compile(r'^/sessions$'), "_start"),
+        ("GET", re.compile(r'^/sessions/(\w+)$'), "_get_session"),
+        ("POST", re.compile(r'^/sessions/(\w+)/turn$'), "_turn"),
+        ("POST", re.compile(r'^/sessions/(\w+)/end$'), "_end"),
+        ("POST", re.compile(r'^/sessions/(\w+)/feedback$'), "_feedback"),
+    ]
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        path = self.path.split("?", 1)[0]
+        for route_method, pattern, handler_name in self.ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                break
+        else:
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        if handler_name == "_metrics":
+            self._send_text(200, get_latency_recorder().to_prometheus(), "text/plain; version=0.0.4")
+            return
+
+        try:
+            body = self._read_json() if method == "POST" else {}
+            self._send_json(200, getattr(self, handler_name)(body, *match.groups()))
+        except SessionNotFound as e:
+            self._send_json(404, {"error": str(e)})
+        except SessionConflict as e:
+            self._send_json(409, {"error": str(e)})
+        except KeyError as e:
+            self._send_json(400, {"error": f"Missing field: {e}"})
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+
+    def _health(self, body):
+        return {"status": "ok"}
+
+    def _metrics_json(self, body):
+        return get_latency_recorder().to_dict()
+
+    def _usage(self, body):
+        return get_usage_ledger().summary()
+
+    def _parse_resume(self, body):
+        try:
+            file_bytes = base64.b64decode(body["content_base64"], validate=True)
+        except binascii.Error:
+            raise ValueError("content_base64 is not valid base64")
+        return self.service.parse_resume(file_bytes, body["file_type"])
+
+    def _start(self, body):
+        return self.service.start_session(body["role"], int(body["duration_minutes"]),
+                                          body.get("candidate_info"), body.get("resume_text"))
+
+    def _get_session(self, body, session_id):
+        return self.service.get_session(session_id)
+
+    def _turn(self, body, session_id):
+        return self.service.take_turn(session_id, body.get("answer", ""))
+
+    def _end(self, body, session_id):
+        return self.service.end_session(session_id)
+
+    def _feedback(self, body, session_id):
+        return self.service.get_feedback(session_id)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise ValueError("Request body must be JSON")
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        return body
+
+    def _send_json(self, status, payload):
+        self._send_text(status, json.dumps(payload), "application/json")
+
+    def _send_text(self, status, text, content_type):
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _TurnHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        # Lets every worker process listen on the same port; the kernel spreads connections across them
+        if hasattr(socket, "SO_REUSEPORT"):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+def create_server(host=TURN_SERVICE_HOST, port=TURN_SERVICE_PORT, service=None):
+    """Build (but don't start) an HTTP server for the turn service"""
+    handler = type("TurnRequestHandler", (_TurnRequestHandler,), {"service": service or TurnService()})
+    return _TurnHTTPServer((host, port), handler)
+
+
+def serve(host=TURN_SERVICE_HOST, port=TURN_SERVICE_PORT):
+    server = create_server(host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Serve interviews over HTTP")
+    arg_parser.add_argument("--host", default=TURN_SERVICE_HOST)
+    arg_parser.add_argument("--port", type=int, default=TURN_SERVICE_PORT)
+    arg_parser.add_argument("--workers", type=int, default=TURN_SERVICE_WORKERS, help="Worker processes sharing the port")
+    args = arg_parser.parse_args()
+
+    print(f"Turn service on http://{args.host}:{args.port} with {args.workers} worker(s)")
+    if args.workers <= 1 or not hasattr(socket, "SO_REUSEPORT"):
+        serve(args.host, args.port)
+        return
+
+    # Stopping the parent (Ctrl+C or SIGTERM) stops every worker
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=serve, args=(args.host, args.port), name=f"turn-worker-{i}") for i in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for worker in workers:
+            worker.terminate()
+
+
+if __name__ == "__main__":
+    main()
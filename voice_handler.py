@@ -1,14 +1,89 @@
 import os
 import tempfile
-import uuid
 import re
 import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from config import TTS_LANGUAGE, TTS_SLOW, TTS_PIPELINE_WORKERS, TTS_MIN_SEGMENT_CHARS
+from tts_cache import get_tts_cache
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+_tts_executor = None
+_tts_executor_lock = threading.Lock()
+
+
+def _get_tts_executor():
+    """Return the process-wide TTS worker pool"""
+    global _tts_executor
+    if _tts_executor is None:
+        with _tts_executor_lock:
+            if _tts_executor is None:
+                _tts_executor = ThreadPoolExecutor(max_workers=TTS_PIPELINE_WORKERS, thread_name_prefix="tts")
+    return _tts_executor
+
+
+class SpeechPipeline:
+    """Splits incoming text into sentences and synthesizes them concurrently, in order"""
+
+    def __init__(self, voice_handler, executor):
+        self._handler = voice_handler
+        self._executor = executor
+        self._buffer = ""
+        self._pending = ""
+        self._futures = deque()
+
+    def feed(self, chunk):
+        """Add streamed text - every completed sentence is queued for synthesis"""
+        self._buffer += chunk
+        parts = SENTENCE_BOUNDARY.split(self._buffer)
+        self._buffer = parts.pop()
+        for sentence in parts:
+            self._add_sentence(sentence)
+
+    def close(self):
+        """Flush the remaining text once the stream is finished"""
+        if self._buffer.strip():
+            self._add_sentence(self._buffer)
+            self._buffer = ""
+        if self._pending:
+            self._submit(self._pending)
+            self._pending = ""
+
+    def _add_sentence(self, sentence):
+        # Merge very short sentences so each segment is worth a TTS round trip
+        self._pending = f"{self._pending} {sentence}".strip()
+        if len(self._pending) >= TTS_MIN_SEGMENT_CHARS:
+            self._submit(self._pending)
+            self._pending = ""
+
+    def _submit(self, text):
+        clean_text = self._handler.clean_text_for_speech(text)
+        if clean_text:
+            self._futures.append(self._executor.submit(self._handler._synthesize, clean_text))
+
+    def ready_segments(self):
+        """Yield finished segment paths in order without waiting"""
+        while self._futures and self._futures[0].done():
+            path = self._futures.popleft().result()
+            if path:
+                yield path
+
+    def segments(self):
+        """Yield all remaining segment paths in order, waiting for each one"""
+        while self._futures:
+            path = self._futures.popleft().result()
+            if path:
+                yield path
+
 
 class VoiceHandler:
     def __init__(self):
         self.temp_dir = tempfile.gettempdir()
         self.audio_dir = os.path.join(self.temp_dir, "interview_audio")
         os.makedirs(self.audio_dir, exist_ok=True)
+        self.cache = get_tts_cache(self.audio_dir)
         
         self.speech_recognition_available = self._check_speech_recognition()
     
@@ -40,24 +115,75 @@ class VoiceHandler:
     
     def text_to_speech_realtime(self, text):
         """Convert text to speech using Google TTS - returns audio path"""
+        return self._synthesize(self.clean_text_for_speech(text))
+    
+    def _synthesize(self, clean_text):
+        """Render already-cleaned text to an MP3 file, reusing cached audio - returns audio path"""
+        if not clean_text:
+            return None
+        
+        key = self.cache.make_key(clean_text, TTS_LANGUAGE, TTS_SLOW)
+        cached_path = self.cache.get(key)
+        if cached_path:
+            return cached_path
+        
         try:
             from gtts import gTTS
             
-            clean_text = self.clean_text_for_speech(text)
-            audio_filename = f"interview_{uuid.uuid4().hex[:8]}.mp3"
-            audio_path = os.path.join(self.audio_dir, audio_filename)
-            
-            tts = gTTS(text=clean_text, lang='en', slow=False)
-            tts.save(audio_path)
-            
-            if os.path.exists(audio_path):
-                return audio_path
-            return None
+            tts = gTTS(text=clean_text, lang=TTS_LANGUAGE, slow=TTS_SLOW)
+            return self.cache.put(key, tts.save)
                 
         except Exception as e:
             print(f"TTS Error: {str(e)}")
             return None
     
+    def start_speech_pipeline(self):
+        """Create a SpeechPipeline that synthesizes sentences as text is fed in"""
+        return SpeechPipeline(self, _get_tts_executor())
+    
+    def text_to_speech_pipelined(self, text):
+        """
+        Synthesize sentence by sentence in a bounded worker pool.
+        Accepts a full string or an iterable of streamed chunks and yields
+        segment paths in order, each as soon as it is ready.
+        """
+        pipeline = self.start_speech_pipeline()
+        chunks = [text] if isinstance(text, str) else text
+        for chunk in chunks:
+            pipeline.feed(chunk)
+            yield from pipeline.ready_segments()
+        pipeline.close()
+        yield from pipeline.segments()
+    
+    def prewarm_speech(self, text):
+        """Synthesize text exactly as a streamed reply would be, so speaking it later is a cache hit - returns audio path"""
+        return self.join_segments(list(self.text_to_speech_pipelined(text)))
+    
+    def join_segments(self, segment_paths):
+        """Concatenate MP3 segments into a single playable file - returns audio path"""
+        if not segment_paths:
+            return None
+        if len(segment_paths) == 1:
+            return segment_paths[0]
+        
+        # Segment files are content-addressed, so their names identify the joined audio
+        key = self.cache.make_key("join", *[os.path.basename(path) for path in segment_paths])
+        cached_path = self.cache.get(key)
+        if cached_path:
+            return cached_path
+        
+        def write_joined(audio_path):
+            with open(audio_path, "wb") as out:
+                for path in segment_paths:
+                    with open(path, "rb") as segment:
+                        out.write(segment.read())
+        
+        try:
+            return self.cache.put(key, write_joined)
+        except Exception as e:
+            print(f"TTS Error: {str(e)}")
+            return None
+    
     def listen_continuous(self, timeout=180, phrase_time_limit=120):
         """
         Listen continuously until user stops speaking or timeout